@@ -3,6 +3,9 @@
 # Description: 'Helper' data structures
 
 
+import array
+
+
 class SLNode:
     def __init__(self, key: str, value: object) -> None:
         """
@@ -97,6 +100,109 @@ class LinkedList:
             cur = cur.next
 
 
+class HashedSLNode:
+    # fixed attribute slots instead of a per-instance __dict__
+    __slots__ = ('next', 'key', 'value', 'hash')
+
+    def __init__(self, key: str, value: object, key_hash: int) -> None:
+        """
+        Singly Linked List Node class that also stores the full hash value
+        of its key, so the key does not have to be hashed again
+        """
+        self.next = None
+        self.key = key
+        self.value = value
+        self.hash = key_hash
+
+    def __str__(self):
+        """ Return content of the node in human-readable form """
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
+
+
+class HashedLinkedList:
+    """
+    Class implementing a Singly Linked List of HashedSLNode objects
+    Supported methods are: insert, push, remove, contains, length, iterator
+
+    Lookups compare the stored hash values before comparing the keys,
+    so most non-matching nodes are skipped without a string compare.
+    """
+
+    __slots__ = ('head', 'size')
+
+    def __init__(self) -> None:
+        """ Init new SLL """
+        self.head = None
+        self.size = 0
+
+    def __str__(self) -> str:
+        """ Return content of SLL in human-readable form """
+        content = ''
+        if self.head is not None:
+            content = str(self.head)
+            cur = self.head.next
+            while cur is not None:
+                content += ' -> ' + str(cur)
+                cur = cur.next
+        return 'SLL [' + content + ']'
+
+    def insert(self, key: str, value: object, key_hash: int) -> None:
+        """ Insert new node at the beginning of the list """
+        new_node = HashedSLNode(key, value, key_hash)
+        new_node.next = self.head
+        self.head = new_node
+        self.size = self.size + 1
+
+    def push(self, node: HashedSLNode) -> None:
+        """ Link an existing node in at the beginning of the list """
+        node.next = self.head
+        self.head = node
+        self.size = self.size + 1
+
+    def remove(self, key: str, key_hash: int) -> bool:
+        """
+        Remove first node with matching key
+        Return True is some node was removed, False otherwise
+        """
+        prev, cur = None, self.head
+        while cur is not None:
+            if cur.hash == key_hash and cur.key == key:
+                if prev:
+                    prev.next = cur.next
+                else:
+                    self.head = cur.next
+                self.size -= 1
+                return True
+            prev, cur = cur, cur.next
+        return False
+
+    def contains(self, key: str, key_hash: int) -> HashedSLNode:
+        """
+        If node with matching key in the list -> return pointer
+        to that node (HashedSLNode), otherwise return None
+        """
+        cur = self.head
+        while cur is not None:
+            if cur.hash == key_hash and cur.key == key:
+                return cur
+            cur = cur.next
+        return cur
+
+    def length(self) -> int:
+        """ Return the length of the list """
+        return self.size
+
+    def __iter__(self) -> HashedSLNode:
+        """
+        Provides iterator capability for the SLL class
+        so it can be used in for ... in ... type of loops.
+        """
+        cur = self.head
+        while cur is not None:
+            yield cur
+            cur = cur.next
+
+
 class DynamicArrayException(Exception):
     pass
 
@@ -168,3 +274,132 @@ class DynamicArray:
     def length(self) -> int:
         """ Return the length of the DA """
         return len(self.data)
+
+
+class TypedDynamicArray:
+    """
+    Dynamic Array of numbers of one C type (an array module typecode, e.g.
+    'q' for 64 bit signed integers or 'd' for doubles), stored unboxed in
+    one contiguous buffer that doubles in capacity when it is full.
+    Supported methods are:
+    append, pop, swap, get_at_index, set_at_index, length, extend, view
+
+    Unlike DynamicArray it can be iterated over, sliced ([a:b] returns a
+    memoryview of the elements, no copy), and exported as a buffer with
+    view() - e.g. numpy.frombuffer(arr.view()) or bytes(arr.view()).
+    A view refers to the storage at the time it was taken: once the array
+    grows into a new buffer, older views no longer see its changes.
+    """
+
+    def __init__(self, arr=None, *, typecode: str = 'q') -> None:
+        """
+        Initialize new typed dynamic array, optionally with the values of arr
+        (same calling convention as DynamicArray; typecode is keyword-only)
+        """
+        self.typecode = typecode
+        self.size = 0
+        self.capacity = 4
+        self.data = array.array(typecode, bytes(self.capacity * array.array(typecode).itemsize))
+        if arr:
+            self.extend(arr)
+
+    def __str__(self) -> str:
+        """ Return content of typed dynamic array in human-readable form """
+        return str(self.data[:self.size].tolist())
+
+    def __iter__(self):
+        """ Provides iterator capability over the elements """
+        return iter(self.data[:self.size])
+
+    def __len__(self) -> int:
+        """ Return the number of elements """
+        return self.size
+
+    def _resize(self, new_capacity: int) -> None:
+        """ Moves the elements into a new buffer with room for new_capacity elements """
+        new_data = array.array(self.typecode, bytes(new_capacity * self.data.itemsize))
+        new_data[:self.size] = self.data[:self.size]
+        self.data = new_data
+        self.capacity = new_capacity
+
+    def append(self, value: object) -> None:
+        """ Add new element at the end of the array, doubling the capacity if it is full """
+        if self.size == self.capacity:
+            self._resize(self.capacity * 2)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values) -> None:
+        """
+        Add every element of the given iterable at the end of the array,
+        growing the capacity (by doubling) at most once
+        """
+        if not isinstance(values, array.array) or values.typecode != self.typecode:
+            values = array.array(self.typecode, values)
+        new_size = self.size + len(values)
+
+        new_capacity = self.capacity
+        while new_capacity < new_size:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self._resize(new_capacity)
+
+        self.data[self.size:new_size] = values
+        self.size = new_size
+
+    def pop(self) -> object:
+        """ Removes element from end of the array and return it """
+        if self.size == 0:
+            raise DynamicArrayException
+        self.size -= 1
+        return self.data[self.size]
+
+    def swap(self, i: int, j: int) -> None:
+        """ Swaps values of two elements given their indicies """
+        if i < 0 or i >= self.size or j < 0 or j >= self.size:
+            raise DynamicArrayException
+        self.data[i], self.data[j] = self.data[j], self.data[i]
+
+    def get_at_index(self, index: int) -> object:
+        """ Return value of element at a given index """
+        if index < 0 or index >= self.size:
+            raise DynamicArrayException
+        return self.data[index]
+
+    def __getitem__(self, index) -> object:
+        """
+        Return value of element at a given index using [] syntax, or a
+        memoryview of the elements for a slice
+        """
+        if isinstance(index, slice):
+            return self.view()[index]
+        return self.get_at_index(index)
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """ Set value of element at a given index """
+        if index < 0 or index >= self.size:
+            raise DynamicArrayException
+        self.data[index] = value
+
+    def __setitem__(self, index: int, value: object) -> None:
+        """ Set value of element at a given index using [] syntax """
+        self.set_at_index(index, value)
+
+    def length(self) -> int:
+        """ Return the length of the DA """
+        return self.size
+
+    def view(self, start: int = 0, stop: int = None) -> memoryview:
+        """
+        Return a memoryview of the elements from start up to (not including)
+        stop, sharing memory with the array
+        """
+        if stop is None:
+            stop = self.size
+        if start < 0 or stop > self.size or start > stop:
+            raise DynamicArrayException
+        return memoryview(self.data)[start:stop]
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Buffer protocol export (Python 3.12+): memoryview(arr) """
+        return self.view()
@@ -0,0 +1,156 @@
+# Course: CS261 - Data Structures
+# Description: Bloom filters - compact sets that answer "definitely not present"
+#              or "possibly present". Used by HashMap to skip the hash function
+#              and the chain walk for keys that are definitely not in the map.
+
+
+import math
+
+_MASK_64 = (1 << 64) - 1
+_MASK_32 = (1 << 32) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+class BloomFilter:
+    """
+    Bloom filter sized for capacity keys at the given false positive rate.
+
+    A key sets hash_count bits picked by double hashing from Python's
+    built-in hash() (cheap compared to HashMap's hash functions, but salted
+    per process, so filters are not stored or shared). Keys cannot be
+    removed; see CountingBloomFilter.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Init new empty filter with the optimal number of bits and hashes
+        for capacity keys at error_rate
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be between 0 and 1')
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.bit_count = max(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.bit_count / self.capacity * math.log(2)), 1)
+        # number of keys added (for CountingBloomFilter, minus the ones removed)
+        self.count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+
+    def _hashes(self, key: object) -> tuple:
+        """
+        Returns the two 32 bit hash values the bit indices are derived from
+        (index i is (hash_1 + i * hash_2) % bit_count). The built-in hash is
+        multiplied by an odd constant first, so small integer keys spread too.
+        """
+        mixed = (hash(key) * _GOLDEN_GAMMA) & _MASK_64
+        return mixed >> 32, (mixed & _MASK_32) | 1
+
+    def add(self, key: object) -> None:
+        """ Adds a key to the filter """
+        hash_1, hash_2 = self._hashes(key)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            index = (hash_1 + i * hash_2) % bit_count
+            bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def might_contain(self, key: object) -> bool:
+        """
+        Returns False if the key was definitely never added, True if it
+        possibly was.
+        """
+        hash_1, hash_2 = self._hashes(key)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            index = (hash_1 + i * hash_2) % bit_count
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def __contains__(self, key: object) -> bool:
+        """ Supports the 'key in bloom_filter' syntax """
+        return self.might_contain(key)
+
+    def clear(self) -> None:
+        """ Removes every key from the filter """
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def estimated_false_positive_rate(self) -> float:
+        """
+        Returns the expected chance that might_contain() is True for a key
+        that was never added, given the number of keys added so far:
+        (1 - e^(-hash_count * count / bit_count)) ^ hash_count
+        """
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
+
+
+class CountingBloomFilter(BloomFilter):
+    """
+    Bloom filter that also supports remove(), using an 8 bit counter per
+    position instead of a single bit (8 times the memory). A counter that
+    reaches 255 stays there, so removes never cause false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """ Init new empty filter """
+        super().__init__(capacity, error_rate)
+        self._bits = None
+        self._counters = bytearray(self.bit_count)
+
+    def add(self, key: object) -> None:
+        """ Adds a key to the filter """
+        hash_1, hash_2 = self._hashes(key)
+        counters, bit_count = self._counters, self.bit_count
+        for i in range(self.hash_count):
+            index = (hash_1 + i * hash_2) % bit_count
+            if counters[index] < 255:
+                counters[index] += 1
+        self.count += 1
+
+    def remove(self, key: object) -> None:
+        """
+        Removes a key from the filter. The key must have been added (and not
+        removed since), otherwise other keys may become false negatives.
+        """
+        hash_1, hash_2 = self._hashes(key)
+        counters, bit_count = self._counters, self.bit_count
+        for i in range(self.hash_count):
+            index = (hash_1 + i * hash_2) % bit_count
+            if counters[index] < 255:
+                counters[index] -= 1
+        self.count -= 1
+
+    def might_contain(self, key: object) -> bool:
+        """
+        Returns False if the key is definitely not in the filter, True if it
+        possibly is.
+        """
+        hash_1, hash_2 = self._hashes(key)
+        counters, bit_count = self._counters, self.bit_count
+        for i in range(self.hash_count):
+            if not counters[(hash_1 + i * hash_2) % bit_count]:
+                return False
+        return True
+
+    def clear(self) -> None:
+        """ Removes every key from the filter """
+        self._counters = bytearray(self.bit_count)
+        self.count = 0
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    for filter_class in (BloomFilter, CountingBloomFilter):
+        print('\n' + filter_class.__name__)
+        print('-' * len(filter_class.__name__))
+        bf = filter_class(10000, 0.01)
+        for i in range(10000):
+            bf.add('key' + str(i))
+        misses = sum(bf.might_contain('other' + str(i)) for i in range(100000))
+        print(bf.bit_count, bf.hash_count, all('key' + str(i) in bf for i in range(10000)))
+        print(round(bf.estimated_false_positive_rate(), 4), round(misses / 100000, 4))
+
+    bf.remove('key0')
+    print('key0' in bf, 'key1' in bf, bf.count)
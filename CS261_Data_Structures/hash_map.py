@@ -6,8 +6,23 @@
 # Description: Implementation of a Hash Map Abstract Data Type with collision resolution using chaining.
 
 
-# Import pre-written DynamicArray and LinkedList classes
+import math
+import os
+import pickle
+import struct
+import time
+
+# Import pre-written DynamicArray and linked list classes
 from a7_include import *
+from bloom_filter import BloomFilter, CountingBloomFilter
+from hash_map_stats import HashMapRecorder
+from key_arena import KeyArena
+
+# NumPy is optional - only the vectorized hash functions need it
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def hash_function_1(key: str) -> int:
@@ -34,50 +49,315 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# keys per chunk hashed at once by the vectorized hash functions, and the
+# longest key allowed in a chunk (every key is padded to the longest one)
+_VECTOR_CHUNK = 4096
+_VECTOR_MAX_KEY_LENGTH = 256
+
+
+def _code_points(keys) -> 'np.ndarray':
+    """
+    Returns a 2-D uint32 array holding the code points of each key of the
+    given NumPy string array in a row, zero padded to the longest key.
+    Byte string (encoded) arrays are decoded as UTF-8 first.
+    """
+    keys = np.asarray(keys)
+    if keys.dtype.kind == 'S':
+        keys = np.char.decode(keys, 'utf-8')
+    keys = np.ascontiguousarray(keys, dtype=str)
+    return keys.view(np.uint32).reshape(keys.shape[0], keys.itemsize // 4)
+
+
+def hash_function_1_vectorized(keys) -> 'np.ndarray':
+    """
+    hash_function_1 of every key of a NumPy array of strings, as an int64
+    array. Padding code points are 0, so they add nothing to the sums.
+    """
+    return _code_points(keys).sum(axis=1, dtype=np.int64)
+
+
+def hash_function_2_vectorized(keys) -> 'np.ndarray':
+    """
+    hash_function_2 of every key of a NumPy array of strings, as an int64
+    array (each code point weighted by its 1-based position in the key).
+    """
+    codes = _code_points(keys)
+    weights = np.arange(1, codes.shape[1] + 1, dtype=np.int64)
+    return codes.astype(np.int64) @ weights
+
+
+# vectorized counterparts used by HashMap's batch methods
+VECTORIZED_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_vectorized,
+    hash_function_2: hash_function_2_vectorized,
+}
+
+
+# 64-bit arithmetic helpers for the hash functions below
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_FNV_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def hash_function_fnv1a(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the UTF-8 encoding of the key.
+    Every byte changes the whole state, so anagrams and keys that only
+    differ in their last characters spread across the table.
+    """
+    hash = _FNV_OFFSET_BASIS
+    for byte in key.encode():
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash
+
+
+def _rotl_64(value: int, shift: int) -> int:
+    """ Rotates a 64-bit value left by shift bits """
+    return ((value << shift) | (value >> (64 - shift))) & _MASK_64
+
+
+def _sip_round(v0: int, v1: int, v2: int, v3: int) -> tuple:
+    """ One SipRound over the four 64-bit state words """
+    v0 = (v0 + v1) & _MASK_64
+    v1 = _rotl_64(v1, 13) ^ v0
+    v0 = _rotl_64(v0, 32)
+    v2 = (v2 + v3) & _MASK_64
+    v3 = _rotl_64(v3, 16) ^ v2
+    v0 = (v0 + v3) & _MASK_64
+    v3 = _rotl_64(v3, 21) ^ v0
+    v2 = (v2 + v1) & _MASK_64
+    v1 = _rotl_64(v1, 17) ^ v2
+    v2 = _rotl_64(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash_2_4(secret: bytes, data: bytes) -> int:
+    """
+    SipHash-2-4 of data keyed with a 16 byte secret. Returns a 64-bit int.
+    """
+    if len(secret) != 16:
+        raise ValueError('SipHash secret must be 16 bytes')
+    k0 = int.from_bytes(secret[:8], 'little')
+    k1 = int.from_bytes(secret[8:], 'little')
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    # compress full 8 byte words
+    tail_start = len(data) - len(data) % 8
+    for i in range(0, tail_start, 8):
+        m = int.from_bytes(data[i:i + 8], 'little')
+        v3 ^= m
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+        v0 ^= m
+
+    # last word holds the remaining bytes and the message length
+    m = int.from_bytes(data[tail_start:], 'little') | ((len(data) & 0xFF) << 56)
+    v3 ^= m
+    v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    v0 ^= m
+
+    # finalization
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = _sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def make_siphash_function(secret: bytes = None):
+    """
+    Returns a hash function computing SipHash-2-4 of the UTF-8 encoded key
+    with the given 16 byte secret (a random one if no secret is given).
+    Without knowing the secret, keys that collide cannot be chosen in advance.
+    """
+    if secret is None:
+        secret = os.urandom(16)
+
+    def hash_function_siphash(key: str) -> int:
+        return siphash_2_4(secret, key.encode())
+
+    return hash_function_siphash
+
+
+def hash_function_builtin(key: str) -> int:
+    """
+    Python's built-in hash() of the key. By far the fastest option, but
+    string hashes are salted per process (see PYTHONHASHSEED), so values
+    must not be stored or shared between processes.
+    """
+    return hash(key)
+
+
+# hash functions that can be selected by name when creating a HashMap
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': hash_function_fnv1a,
+    'siphash': make_siphash_function(),
+    'builtin': hash_function_builtin,
+}
+
+# hash functions that give a key the same value in every process, so their
+# hash values can be stored in files and used again later
+PERSISTENT_HASH_FUNCTIONS = ('hash_function_1', 'hash_function_2', 'fnv1a')
+
+
+def hash_function_name(function) -> str:
+    """
+    Returns the HASH_FUNCTIONS name of the given hash function (a name is
+    returned as is), or None if the function is not in HASH_FUNCTIONS.
+    Wrappers made with functools.wraps (e.g. by enable_stats) are unwrapped.
+    """
+    if isinstance(function, str):
+        return function if function in HASH_FUNCTIONS else None
+    function = getattr(function, '__wrapped__', function)
+    for name, value in HASH_FUNCTIONS.items():
+        if value is function:
+            return name
+    return None
+
+
+# snapshot file layout used by HashMap.save() and HashMap.load()
+_SNAPSHOT_MAGIC = b'HMAPSNP1'
+_SNAPSHOT_HEADER = struct.Struct('<8sQQH')
+_SNAPSHOT_KEY = struct.Struct('<IB')
+_SNAPSHOT_VALUE = struct.Struct('<Q')
+
+
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, max_load_factor: float = None,
+                 min_load_factor: float = None, incremental_resize: bool = False,
+                 rehash_step: int = 4, bloom_filter: str = None,
+                 bloom_error_rate: float = 0.01, key_arena=None) -> None:
         """
-        Init new HashMap based on DA with SLL for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Init new HashMap based on DA with SLL for collision resolution.
+        Every node keeps the hash value of its key, so resizing never calls
+        the hash function again.
+
+        function is either a hash function or the name of one of the
+        functions in HASH_FUNCTIONS.
+
+        If max_load_factor is given, put() doubles the capacity whenever the
+        load factor exceeds it. If min_load_factor is also given, remove()
+        halves the capacity (never below the initial capacity) whenever the
+        load factor drops below it. Without them the capacity only changes
+        through resize_table().
+
+        If incremental_resize is True, resize_table() only swaps in a new
+        bucket array and every following put/get/remove/contains_key moves
+        up to rehash_step buckets out of the old array, so no single call
+        pays for rehashing the whole table. With a low max_load_factor more
+        buckets are moved per call, so the old array is always empty before
+        the next resize is due.
+
+        If bloom_filter is 'plain' or 'counting', a Bloom filter of the keys
+        lets get/contains_key/remove return right away for most keys that
+        are not in the hash map, without calling the hash function or
+        walking a chain. A plain filter keeps the bits of removed keys until
+        it is rebuilt (when the keys added outgrow it); a counting filter
+        forgets removed keys but uses 8 times the memory. See bloom_stats().
+
+        If key_arena is True (or a KeyArena to share with other maps), the
+        (string) keys are stored once each in the arena and nodes only keep
+        their offset - see key_arena.py.
         """
         self.buckets = DynamicArray()
         for _ in range(capacity):
-            self.buckets.append(LinkedList())
+            self.buckets.append(HashedLinkedList())
         self.capacity = capacity
-        self.hash_function = function
+        self.hash_function = HASH_FUNCTIONS[function] if isinstance(function, str) else function
         self.size = 0
 
+        # number of non-empty buckets in self.buckets, kept up to date by every
+        # method that adds nodes to or removes nodes from a bucket
+        self._occupied = 0
+
+        # bumped whenever keys are added or removed or nodes change bucket,
+        # so iterators can detect that the hash map changed under them
+        self._mod_count = 0
+
+        if max_load_factor is not None and max_load_factor <= 0:
+            raise ValueError('max_load_factor must be positive')
+        # a shrink must leave the load factor at or under the growth threshold,
+        # otherwise put and remove could keep resizing back and forth
+        if min_load_factor is not None:
+            if max_load_factor is None or min_load_factor * 2 > max_load_factor:
+                raise ValueError('min_load_factor requires max_load_factor >= 2 * min_load_factor')
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self._min_capacity = capacity
+
+        # incremental resize state - while _old_buckets is not None, buckets
+        # below _rehash_index in it have already been moved to self.buckets
+        if rehash_step < 1:
+            raise ValueError('rehash_step must be at least 1')
+        self.incremental_resize = incremental_resize
+        self.rehash_step = rehash_step
+        self._old_buckets = None
+        self._rehash_index = 0
+        # buckets moved per operation during the current resize (see _rehash_batch)
+        self._rehash_batch = rehash_step
+
+        # resize statistics (times in seconds)
+        self.resize_count = 0
+        self.resize_time = 0.0
+        self.resize_time_max = 0.0
+
+        # optional Bloom filter of the keys, and how often it answered a lookup
+        # on its own (negatives) or let a missing key through (false positives)
+        if bloom_filter not in (None, 'plain', 'counting'):
+            raise ValueError("bloom_filter must be None, 'plain' or 'counting'")
+        self._bloom_class = {None: None, 'plain': BloomFilter, 'counting': CountingBloomFilter}[bloom_filter]
+        self.bloom_error_rate = bloom_error_rate
+        self._bloom = None
+        if self._bloom_class is not None:
+            self._bloom = self._bloom_class(max(capacity, 16), bloom_error_rate)
+        self.bloom_negatives = 0
+        self.bloom_false_positives = 0
+
+        # instrumentation, off until enable_stats() is called
+        self._recorder = None
+
+        # optional arena the keys of new nodes are interned in
+        self._key_arena = KeyArena() if key_arena is True else key_arena or None
+
     def __str__(self) -> str:
         """
         Return content of hash map t in human-readable form
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_rehash()
         out = ''
         for i in range(self.buckets.length()):
             list = self.buckets.get_at_index(i)
+            # buckets of a table built by an incremental resize are created on first use
+            if list is None:
+                list = HashedLinkedList()
             out += str(i) + ': ' + str(list) + '\n'
         return out
 
     def clear(self) -> None:
         """
-        Replace the contents of each bucket that contains a node(s) with an
-        empty linked list and set hash map size to 0. Return nothing.
+        Removes every node from the hash map and sets hash map size to 0.
+        Capacity is unchanged. Return nothing.
         """
-        # set index counter to 0
-        ind = 0
-
-        # iterate through buckets
-        while ind < self.buckets.length():
-            # save length of the linked list in the bucket
-            ll_size = self.buckets.get_at_index(ind).length()
+        # nothing to do if no bucket holds a node
+        if self.size == 0 and self._occupied == 0:
+            return None
 
-            # if the bucket is not empty, replace it with an empty LL
-            if ll_size != 0:
-                self.buckets.set_at_index(ind, LinkedList())
-                # reduce size of hash map by number of nodes removed
-                self.size -= ll_size
+        # drop any buckets still waiting to be moved by an incremental resize
+        self._old_buckets = None
 
-            ind += 1  # next index
+        # replace the bucket array in one step instead of walking every bucket -
+        # buckets are created again on first use, as after an incremental resize
+        self.buckets = DynamicArray([None] * self.capacity)
+        self._occupied = 0
+        self.size = 0
+        self._mod_count += 1
+        if self._bloom is not None:
+            self._bloom.clear()
 
     def get(self, key: str) -> object:
         """
@@ -88,16 +368,22 @@ class HashMap:
         if self.size == 0:
             return None
 
-        # generate hash value from key
-        key_hash = self.hash_function(key)
-        # convert hash value to index
-        index = key_hash % self.buckets.length()
+        # the Bloom filter rules out most missing keys before any hashing
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            self.bloom_negatives += 1
+            return None
 
-        # find bucket at index and check through the bucket to see if it contains the key
-        key_node = self.buckets.get_at_index(index).contains(key)
+        # move part of the table along if a resize is in progress
+        if self._old_buckets is not None:
+            self._rehash_step(self._rehash_batch)
+
+        # find the node holding the key
+        key_node = self._find_node(key, self.hash_function(key))
 
         # if bucket does not contain key, return None
         if key_node is None:
+            if self._bloom is not None:
+                self.bloom_false_positives += 1
             return None
 
         # return key value if bucket contains key
@@ -113,33 +399,32 @@ class HashMap:
         if self.capacity == 0:
             return None
 
+        # move part of the table along if a resize is in progress
+        if self._old_buckets is not None:
+            self._rehash_step(self._rehash_batch)
+
         # generate hash value from key
         key_hash = self.hash_function(key)
-        # convert hash value to index
-        index = key_hash % self.buckets.length()
-
-        # find bucket at index
-        bucket = self.buckets.get_at_index(index)
 
-        # if bucket is empty, insert key value pair
-        if bucket.length() == 0:
-            bucket.insert(key, value)
-            self.size += 1
-            return None
-
-        # check through the bucket to see if it contains the key
-        replace_node = bucket.contains(key)
-
-        # if bucket does not contain key, insert key value pair
-        if replace_node is None:
-            bucket.insert(key, value)
-            self.size += 1
+        # if the hash map already contains the key, replace only the value in that node
+        replace_node = self._find_node(key, key_hash)
+        if replace_node is not None:
+            replace_node.value = value
             return None
 
-        # if the bucket DOES contain the key, replace only the value in that node
+        # otherwise insert key value pair into the bucket at the hashed index
+        bucket = self._bucket_at(key_hash % self.capacity)
+        if bucket.length() == 0:
+            self._occupied += 1
+        if self._key_arena is None:
+            bucket.insert(key, value, key_hash)
         else:
-            replace_node.value = value
-            return None
+            bucket.push(self._key_arena.node(key, value, key_hash))
+        self.size += 1
+        self._mod_count += 1
+        if self._bloom is not None:
+            self._bloom_add(key)
+        self._grow_if_needed()
 
     def remove(self, key: str) -> None:
         """
@@ -151,17 +436,300 @@ class HashMap:
         if self.size == 0:
             return None
 
+        # nothing to remove if the Bloom filter rules the key out
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            return None
+
+        # move part of the table along if a resize is in progress
+        if self._old_buckets is not None:
+            self._rehash_step(self._rehash_batch)
+
         # generate hash value from key
         key_hash = self.hash_function(key)
-        # convert hash value to index
-        index = key_hash % self.buckets.length()
 
-        # find bucket at index and remove key if it exists (remove() returns True if it does, False otherwise)
-        key_node = self.buckets.get_at_index(index).remove(key)
+        # remove key from the old bucket array if its bucket has not been moved yet
+        # (remove() returns True if the key was in the list, False otherwise)
+        key_node = False
+        if self._old_buckets is not None:
+            old_ind = key_hash % self._old_buckets.length()
+            if old_ind >= self._rehash_index:
+                key_node = self._unlink(self._old_buckets.get_at_index(old_ind), key, key_hash)
+
+        # otherwise remove key from the bucket at the hashed index
+        if key_node is False:
+            bucket = self.buckets.get_at_index(key_hash % self.capacity)
+            key_node = self._unlink(bucket, key, key_hash)
+            if key_node is True and bucket.length() == 0:
+                self._occupied -= 1
 
         # decrease hash map size if key was removed
         if key_node is True:
             self.size -= 1
+            self._mod_count += 1
+            if self._bloom_class is CountingBloomFilter:
+                self._bloom.remove(key)
+            self._shrink_if_needed()
+
+    def _unlink(self, bucket: HashedLinkedList, key: str, key_hash: int) -> bool:
+        """
+        Removes the given key from a bucket (None for a bucket that was never
+        created). Returns True if the key was in it, otherwise False. Used by
+        remove(), so that HashMapRecorder can record its chain walk.
+        """
+        return bucket is not None and bucket.remove(key, key_hash)
+
+    def _find_node(self, key: str, key_hash: int) -> HashedSLNode:
+        """
+        Returns the node holding the given key, or None if the key is not
+        in the hash map.
+        """
+        # a key whose old bucket has not been moved yet is either still in that
+        # bucket or was inserted into the new array after the resize started
+        if self._old_buckets is not None:
+            old_ind = key_hash % self._old_buckets.length()
+            if old_ind >= self._rehash_index:
+                bucket = self._old_buckets.get_at_index(old_ind)
+                if bucket is not None:
+                    node = bucket.contains(key, key_hash)
+                    if node is not None:
+                        return node
+
+        # check the bucket at the hashed index of the current bucket array
+        bucket = self.buckets.get_at_index(key_hash % self.capacity)
+        if bucket is None:
+            return None
+        return bucket.contains(key, key_hash)
+
+    def _bucket_at(self, index: int) -> HashedLinkedList:
+        """
+        Returns the bucket at the given index of the current bucket array,
+        creating it first if the array was built by an incremental resize.
+        """
+        bucket = self.buckets.get_at_index(index)
+        if bucket is None:
+            bucket = HashedLinkedList()
+            self.buckets.set_at_index(index, bucket)
+        return bucket
+
+    def _grow_if_needed(self) -> None:
+        """
+        Doubles the capacity if the load factor is above max_load_factor.
+        """
+        if self.max_load_factor is not None and self.size / self.capacity > self.max_load_factor:
+            self.resize_table(self.capacity * 2)
+
+    def _shrink_if_needed(self) -> None:
+        """
+        Halves the capacity (down to the initial capacity) if the load factor
+        is below min_load_factor.
+        """
+        if self.min_load_factor is None or self.capacity <= self._min_capacity:
+            return None
+        if self.size / self.capacity < self.min_load_factor:
+            self.resize_table(max(self.capacity // 2, self._min_capacity))
+
+    def _bloom_add(self, key: str) -> None:
+        """
+        Adds a key that was just inserted to the Bloom filter, rebuilding
+        the filter twice as large once more keys were added than it was
+        sized for (this also drops the bits of keys removed from a plain
+        filter).
+        """
+        self._bloom.add(key)
+        if self._bloom.count > self._bloom.capacity:
+            self._rebuild_bloom(max(self.size * 2, 16))
+
+    def _rebuild_bloom(self, capacity: int) -> None:
+        """
+        Replaces the Bloom filter with a new one sized for capacity keys
+        holding every key of the hash map. Reads the keys in place, so an
+        incremental resize in progress is left alone.
+        """
+        bloom = self._bloom_class(capacity, self.bloom_error_rate)
+        arrays = [(self.buckets, 0)]
+        if self._old_buckets is not None:
+            arrays.append((self._old_buckets, self._rehash_index))
+
+        for buckets, start in arrays:
+            for ind in range(start, buckets.length()):
+                bucket = buckets.get_at_index(ind)
+                if bucket is not None:
+                    for node in bucket:
+                        bloom.add(node.key)
+        self._bloom = bloom
+
+    def bloom_stats(self) -> dict:
+        """
+        Returns a dictionary describing the Bloom filter (None if the hash
+        map has none): its size in bits, number of hashes and keys, the
+        false positive rate expected from those, and the rate observed so
+        far - the share of get/contains_key calls for missing keys that the
+        filter let through to the hash table.
+        """
+        if self._bloom is None:
+            return None
+        misses = self.bloom_negatives + self.bloom_false_positives
+        return {'bits': self._bloom.bit_count,
+                'hashes': self._bloom.hash_count,
+                'keys': self._bloom.count,
+                'estimated_false_positive_rate': self._bloom.estimated_false_positive_rate(),
+                'observed_false_positive_rate': self.bloom_false_positives / misses if misses else 0.0,
+                'negatives': self.bloom_negatives,
+                'false_positives': self.bloom_false_positives}
+
+    def enable_stats(self) -> None:
+        """
+        Starts recording chain walk lengths, hash function times and resizes
+        (see hash_map_stats.HashMapRecorder), keeping anything recorded
+        before. Until this is called, the hash map does no recording work.
+        """
+        if self._recorder is None:
+            self._recorder = HashMapRecorder(self)
+        self._recorder.attach()
+
+    def disable_stats(self) -> None:
+        """
+        Stops recording. What was recorded stays available from stats().
+        """
+        if self._recorder is not None:
+            self._recorder.detach()
+
+    def stats(self) -> dict:
+        """
+        Returns what was recorded since enable_stats() as a dictionary:
+        operation counts, histograms and percentiles of the chain walk
+        lengths (per operation and overall) and hash times, and the list
+        of resizes. Returns None if stats were never enabled.
+        """
+        if self._recorder is None:
+            return None
+        return self._recorder.stats()
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds every key:value pair of the given iterable to the hash map, as
+        if put() was called for each pair in order. The table is resized at
+        most once up front and all keys are hashed in one pass.
+        """
+        if self.capacity == 0:
+            return None
+
+        keys, values = [], []
+        for key, value in pairs:
+            keys.append(key)
+            values.append(value)
+
+        # resize once for the whole batch instead of repeatedly while inserting
+        self._finish_rehash()
+        if self.max_load_factor is not None:
+            new_capacity = self.capacity
+            while (self.size + len(keys)) / new_capacity > self.max_load_factor:
+                new_capacity *= 2
+            if new_capacity != self.capacity:
+                self.resize_table(new_capacity)
+                self._finish_rehash()
+
+        capacity = self.capacity
+        for key, value, key_hash in zip(keys, values, self._hash_many(keys)):
+            bucket = self._bucket_at(key_hash % capacity)
+
+            # replace the value if the key is already present, otherwise insert
+            node = bucket.contains(key, key_hash)
+            if node is not None:
+                node.value = value
+            else:
+                if bucket.length() == 0:
+                    self._occupied += 1
+                if self._key_arena is None:
+                    bucket.insert(key, value, key_hash)
+                else:
+                    bucket.push(self._key_arena.node(key, value, key_hash))
+                self.size += 1
+                self._mod_count += 1
+                if self._bloom is not None:
+                    self._bloom_add(key)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a new DynamicArray holding the value of each of the given
+        keys, in the same order (None for keys not in the hash map).
+        """
+        keys = list(keys)
+        results = [None] * len(keys)
+        if self.size == 0:
+            return DynamicArray(results)
+
+        self._finish_rehash()
+        capacity = self.capacity
+        for pos, key_hash in enumerate(self._hash_many(keys)):
+            bucket = self.buckets.get_at_index(key_hash % capacity)
+            if bucket is not None:
+                node = bucket.contains(keys[pos], key_hash)
+                if node is not None:
+                    results[pos] = node.value
+
+        return DynamicArray(results)
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys from the hash map. Keys that are not
+        in the hash map are ignored. The table shrinks (if min_load_factor
+        is set) only once the whole batch has been removed.
+        """
+        keys = list(keys)
+        if self.size == 0:
+            return None
+
+        self._finish_rehash()
+        capacity = self.capacity
+        for key, key_hash in zip(keys, self._hash_many(keys)):
+            self._remove_from_bucket(self.buckets.get_at_index(key_hash % capacity), key, key_hash)
+
+        # shrink as many times as the smaller size allows
+        old_capacity = None
+        while old_capacity != self.capacity:
+            old_capacity = self.capacity
+            self._shrink_if_needed()
+
+    def _remove_from_bucket(self, bucket: HashedLinkedList, key: str, key_hash: int) -> bool:
+        """
+        Removes the given key from a bucket of the current bucket array (not
+        of an array a resize is moving away from) and updates the size,
+        occupied bucket count and Bloom filter. Does not shrink the table.
+        Returns True if the key was in the bucket, otherwise False.
+        """
+        if bucket is None or not bucket.remove(key, key_hash):
+            return False
+        self.size -= 1
+        self._mod_count += 1
+        if bucket.length() == 0:
+            self._occupied -= 1
+        if self._bloom_class is CountingBloomFilter:
+            self._bloom.remove(key)
+        return True
+
+    def _hash_many(self, keys: list) -> list:
+        """
+        Returns a list with the hash value of each of the given keys.
+        Uses the vectorized version of the hash function when NumPy is
+        installed and one exists.
+        """
+        vectorized = VECTORIZED_HASH_FUNCTIONS.get(self.hash_function)
+        if np is None or vectorized is None:
+            return list(map(self.hash_function, keys))
+
+        hashes = []
+        for start in range(0, len(keys), _VECTOR_CHUNK):
+            chunk = keys[start:start + _VECTOR_CHUNK]
+
+            # non-string keys and very long keys (which would blow up the
+            # padded array) are left to the scalar hash function
+            if any(type(key) is not str or len(key) > _VECTOR_MAX_KEY_LENGTH for key in chunk):
+                hashes.extend(map(self.hash_function, chunk))
+            else:
+                hashes.extend(vectorized(np.array(chunk, dtype=str)).tolist())
+
+        return hashes
 
     def contains_key(self, key: str) -> bool:
         """
@@ -172,15 +740,21 @@ class HashMap:
         if self.size == 0:
             return False
 
-        # generate hash value from key
-        key_hash = self.hash_function(key)
-        # convert hash value to index
-        index = key_hash % self.buckets.length()
+        # the Bloom filter rules out most missing keys before any hashing
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            self.bloom_negatives += 1
+            return False
+
+        # move part of the table along if a resize is in progress
+        if self._old_buckets is not None:
+            self._rehash_step(self._rehash_batch)
 
-        # check if bucket at index contains the key. if it does, return True. Otherwise, return False
-        if self.buckets.get_at_index(index).contains(key) is not None:
+        # check if the hash map contains the key. if it does, return True. Otherwise, return False
+        if self._find_node(key, self.hash_function(key)) is not None:
             return True
         else:
+            if self._bloom is not None:
+                self.bloom_false_positives += 1
             return False
 
     def empty_buckets(self) -> int:
@@ -188,20 +762,11 @@ class HashMap:
         Counts the number of buckets in the hash map that do not contain
         any nodes with data and returns that number.
         """
-        # set index and empty counter to 0
-        ind = 0
-        empty_count = 0
-
-        # iterate through buckets
-        while ind < self.buckets.length():
-
-            # if the bucket is empty, increase empty count by 1
-            if self.buckets.get_at_index(ind).length() == 0:
-                empty_count += 1
-
-            ind += 1  # next index
+        # bucket counts are only meaningful once every entry is in the current array
+        self._finish_rehash()
 
-        return empty_count  # total number of empty buckets
+        # every bucket that is not counted as occupied is empty
+        return self.capacity - self._occupied
 
     def table_load(self) -> float:
         """
@@ -211,55 +776,306 @@ class HashMap:
         # hash table load factor = total number of elements/number of buckets
         return self.size / self.capacity
 
+    def chain_length_distribution(self) -> dict:
+        """
+        Returns a dictionary mapping each chain length found in the hash map
+        to the number of buckets with a chain of that length.
+        (e.g. {0: 12, 1: 30, 2: 8} - 12 empty buckets, 30 with one node...)
+        """
+        # chain lengths are only meaningful once every entry is in the current array
+        self._finish_rehash()
+
+        distribution = {}
+        for ind in range(self.buckets.length()):
+            bucket = self.buckets.get_at_index(ind)
+            length = 0 if bucket is None else bucket.length()
+            distribution[length] = distribution.get(length, 0) + 1
+
+        return distribution
+
     def resize_table(self, new_capacity: int) -> None:
         """
         Given a new capacity that is >= 1, replaces the current hash map
         with a new hash map of the given capacity containing all of the
         same key:value pairs with indices rehashed based on the new capacity.
         Returns nothing.
+
+        With incremental_resize, only the new (empty) bucket array is set up
+        here and the entries are moved over by later operations.
         """
         # do nothing if new capacity < 1
         if new_capacity < 1:
             return None
 
+        # a resize still in progress has to complete before another one starts
+        self._finish_rehash()
+
+        start = time.perf_counter()
+        self._mod_count += 1
+
+        if self.incremental_resize:
+            # buckets of the new array are only created once something is put in them,
+            # so setting it up does not allocate a LinkedList per bucket
+            self._old_buckets = self.buckets
+            self._rehash_index = 0
+            self._rehash_batch = self._rehash_batch_size(self.capacity, new_capacity)
+            self.buckets = DynamicArray([None] * new_capacity)
+            self.capacity = new_capacity
+            self._occupied = 0
+            self.resize_count += 1
+            self._record_resize_time(time.perf_counter() - start)
+            return None
+
         # create new hashmap
         temp_hm = DynamicArray()
 
         # add linked lists to new da until it reaches new capacity
         while temp_hm.length() < new_capacity:
-            temp_hm.append(LinkedList())
+            temp_hm.append(HashedLinkedList())
 
-        # bookmark current index
+        # bookmark current index and count non-empty buckets of the new hashmap
         cur_ind = 0
+        occupied = 0
 
         # iterate through current hashmap and add the contents of each bucket to the new hashmap
         while cur_ind < self.capacity:
             # save contents of current bucket
             cur_bucket = self.buckets.get_at_index(cur_ind)
 
-            # if bucket contains anything, add its contents to the new hashmap
-            if cur_bucket.length() != 0:
-                # iterate through linked list using iterator
-                for node in cur_bucket:
-                    # generate hash value from key
-                    key_hash = self.hash_function(node.key)
-                    # convert hash value to index
-                    new_ind = key_hash % new_capacity
-
-                    # add node at the new index in the new hashmap
-                    temp_hm.get_at_index(new_ind).insert(node.key, node.value)
+            # if bucket contains anything, move its nodes to the new hashmap
+            if cur_bucket is not None:
+                node = cur_bucket.head
+                while node is not None:
+                    # save next node before the move relinks this one
+                    next_node = node.next
+                    # convert stored hash value to index
+                    new_bucket = temp_hm.get_at_index(node.hash % new_capacity)
+
+                    # link node in at the new index in the new hashmap
+                    if new_bucket.length() == 0:
+                        occupied += 1
+                    new_bucket.push(node)
+                    node = next_node
 
             cur_ind += 1
 
         # overwrite current hashmap buckets with new hashmap buckets and update capacity
         self.buckets = temp_hm
         self.capacity = temp_hm.length()
+        self._occupied = occupied
+
+        # record resize statistics
+        self.resize_count += 1
+        self._record_resize_time(time.perf_counter() - start)
+
+    def _rehash_batch_size(self, old_capacity: int, new_capacity: int) -> int:
+        """
+        Returns how many buckets each operation moves during an incremental
+        resize from old_capacity to new_capacity buckets: rehash_step, or
+        more if that would not empty the old array before enough puts (or
+        removes) reach the next load factor threshold - the resize after
+        that would otherwise have to finish this one in a single call.
+        """
+        # operations left until put or remove would start the next resize
+        headroom = None
+        if self.max_load_factor is not None:
+            headroom = int(new_capacity * self.max_load_factor) - self.size + 1
+        if self.min_load_factor is not None:
+            shrink_headroom = self.size - math.ceil(new_capacity * self.min_load_factor) + 1
+            headroom = shrink_headroom if headroom is None else min(headroom, shrink_headroom)
+
+        if headroom is None:
+            return self.rehash_step
+        return max(self.rehash_step, math.ceil(old_capacity / max(headroom, 1)))
+
+    def _rehash_step(self, bucket_count: int) -> None:
+        """
+        Moves up to bucket_count buckets of the old bucket array into the
+        current one. Ends the incremental resize once the old array is empty.
+        """
+        start = time.perf_counter()
+        old_buckets = self._old_buckets
+        stop = min(self._rehash_index + bucket_count, old_buckets.length())
+
+        while self._rehash_index < stop:
+            bucket = old_buckets.get_at_index(self._rehash_index)
+
+            # move every node of the bucket into the current bucket array
+            if bucket is not None:
+                node = bucket.head
+                while node is not None:
+                    next_node = node.next
+                    new_bucket = self._bucket_at(node.hash % self.capacity)
+                    if new_bucket.length() == 0:
+                        self._occupied += 1
+                    new_bucket.push(node)
+                    node = next_node
+
+            # release the moved bucket right away
+            old_buckets.set_at_index(self._rehash_index, None)
+            self._rehash_index += 1
+
+        if self._rehash_index == old_buckets.length():
+            self._old_buckets = None
+
+        self._record_resize_time(time.perf_counter() - start)
+
+    def _finish_rehash(self) -> None:
+        """
+        Completes an incremental resize that is in progress, if any.
+        """
+        if self._old_buckets is not None:
+            self._rehash_step(self._old_buckets.length())
+
+    def _record_resize_time(self, elapsed: float) -> None:
+        """
+        Adds the time spent on a resize (or one step of it) to the statistics.
+        """
+        self.resize_time += elapsed
+        self.resize_time_max = max(self.resize_time_max, elapsed)
+
+    def _nodes(self):
+        """
+        Generator yielding every node of the hash map, bucket by bucket.
+        Raises RuntimeError if the hash map changes size or resizes while
+        the generator is in use (updating the value of a key is allowed).
+        """
+        # make sure every entry is in the current bucket array
+        self._finish_rehash()
+        mod_count = self._mod_count
+        buckets = self.buckets
+
+        for ind in range(buckets.length()):
+            bucket = buckets.get_at_index(ind)
+            if bucket is None:
+                continue
+
+            node = bucket.head
+            while node is not None:
+                yield node
+                # the caller ran while the generator was paused - check what it did
+                if self._mod_count != mod_count:
+                    raise RuntimeError('HashMap changed during iteration')
+                node = node.next
+
+    def keys(self):
+        """
+        Returns a generator over the keys of the hash map.
+        """
+        return (node.key for node in self._nodes())
+
+    def values(self):
+        """
+        Returns a generator over the values of the hash map.
+        """
+        return (node.value for node in self._nodes())
+
+    def items(self):
+        """
+        Returns a generator over the (key, value) pairs of the hash map.
+        """
+        return ((node.key, node.value) for node in self._nodes())
+
+    def __iter__(self):
+        """
+        Provides iterator capability over the keys of the hash map
+        so it can be used in for ... in ... type of loops.
+        """
+        return self.keys()
+
+    def __len__(self) -> int:
+        """ Return the number of key:value pairs in the hash map """
+        return self.size
+
+    def __contains__(self, key: str) -> bool:
+        """ Supports the 'key in hash_map' syntax """
+        return self.contains_key(key)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map to a binary snapshot file at path, one entry at
+        a time (the entries are never all copied into memory at once).
+
+        Layout (integers little-endian): magic, capacity, size, length of the
+        hash function name, the name (empty if the function is not in
+        HASH_FUNCTIONS), then per entry: key length, hash value length, the
+        UTF-8 key, the signed hash value, pickled value length, pickled value.
+        """
+        name = (hash_function_name(self.hash_function) or '').encode()
+
+        with open(path, 'wb') as out_file:
+            out_file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self.capacity, self.size, len(name)))
+            out_file.write(name)
+
+            for node in self._nodes():
+                key_bytes = node.key.encode()
+                hash_bytes = node.hash.to_bytes((node.hash.bit_length() + 8) // 8, 'little', signed=True)
+                value_bytes = pickle.dumps(node.value)
+                out_file.write(_SNAPSHOT_KEY.pack(len(key_bytes), len(hash_bytes)))
+                out_file.write(key_bytes)
+                out_file.write(hash_bytes)
+                out_file.write(_SNAPSHOT_VALUE.pack(len(value_bytes)))
+                out_file.write(value_bytes)
+
+    @classmethod
+    def load(cls, path: str, function=None, **options) -> 'HashMap':
+        """
+        Returns a new HashMap with the capacity and entries of the snapshot
+        file at path, reading it one entry at a time. function defaults to
+        the hash function the snapshot was saved with; options are passed on
+        to HashMap() (e.g. max_load_factor).
+
+        The stored hash values are used as they are when the snapshot was
+        saved with the same function and that function is in
+        PERSISTENT_HASH_FUNCTIONS; otherwise every key is hashed again.
+        """
+        with open(path, 'rb') as in_file:
+            magic, capacity, size, name_length = _SNAPSHOT_HEADER.unpack(in_file.read(_SNAPSHOT_HEADER.size))
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(path + ' is not a HashMap snapshot')
+            saved_name = in_file.read(name_length).decode()
+
+            if function is None:
+                if saved_name not in HASH_FUNCTIONS:
+                    raise ValueError(path + ' was saved with an unknown hash function')
+                function = saved_name
+            m = cls(capacity, function, **options)
+            reuse_hashes = (saved_name in PERSISTENT_HASH_FUNCTIONS
+                            and hash_function_name(m.hash_function) == saved_name)
+
+            for _ in range(size):
+                key_length, hash_length = _SNAPSHOT_KEY.unpack(in_file.read(_SNAPSHOT_KEY.size))
+                key = in_file.read(key_length).decode()
+                key_hash = int.from_bytes(in_file.read(hash_length), 'little', signed=True)
+                value_length = _SNAPSHOT_VALUE.unpack(in_file.read(_SNAPSHOT_VALUE.size))[0]
+                value = pickle.loads(in_file.read(value_length))
+
+                if not reuse_hashes:
+                    key_hash = m.hash_function(key)
+
+                # snapshot keys are unique, so each one goes straight to its bucket
+                bucket = m._bucket_at(key_hash % m.capacity)
+                if bucket.length() == 0:
+                    m._occupied += 1
+                if m._key_arena is None:
+                    bucket.insert(key, value, key_hash)
+                else:
+                    bucket.push(m._key_arena.node(key, value, key_hash))
+                m.size += 1
+                if m._bloom is not None:
+                    m._bloom_add(key)
+
+        m._mod_count += 1
+        return m
 
     def get_keys(self) -> DynamicArray:
         """
         Finds all keys in the hash map and returns them in a
         new DynamicArray object.
         """
+        # make sure every entry is in the current bucket array
+        self._finish_rehash()
+
         # create temporary da
         temp_da = DynamicArray()
 
@@ -272,7 +1088,7 @@ class HashMap:
             cur_bucket = self.buckets.get_at_index(cur_ind)
 
             # if bucket contains anything, add its contents to the new hashmap
-            if cur_bucket.length() != 0:
+            if cur_bucket is not None and cur_bucket.length() != 0:
                 # iterate through linked list using iterator
                 for node in cur_bucket:
                     # append key to temp da
@@ -479,3 +1295,116 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+
+    print("\nautomatic resize example")
+    print("------------------------")
+    m = HashMap(10, hash_function_2, max_load_factor=1.0, min_load_factor=0.25)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity, m.table_load() <= 1.0, m.resize_count)
+    for i in range(990):
+        m.remove('key' + str(i))
+    print(m.size, m.capacity, m.get('key995'), m.resize_count)
+
+
+    print("\nincremental resize example")
+    print("--------------------------")
+    m = HashMap(10, hash_function_2, max_load_factor=1.0, incremental_resize=True)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    result = True
+    for i in range(1000):
+        result &= m.get('key' + str(i)) == i
+    print(m.size, m.capacity, result, m.resize_count, m.get_keys().length())
+
+
+    print("\nhash function chain length example")
+    print("----------------------------------")
+    print(siphash_2_4(bytes(range(16)), bytes(range(15))) == 0xA129CA6149BE45E5)
+    for name in HASH_FUNCTIONS:
+        m = HashMap(100, name)
+        for i in range(100):
+            m.put('key' + str(i), i)
+        distribution = m.chain_length_distribution()
+        print(name, distribution.get(0, 0), max(distribution))
+
+
+    print("\niterator example")
+    print("----------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(5):
+        m.put('key' + str(i), i * 10)
+    print(len(m), 'key3' in m, 'key9' in m, sorted(m), sum(m.values()))
+    print(sorted(m.items()))
+    try:
+        for key in m:
+            m.remove(key)
+    except RuntimeError as error:
+        print('RuntimeError:', error)
+
+
+    print("\nsave / load example")
+    print("-------------------")
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'example.snapshot')
+    m = HashMap(53, 'fnv1a')
+    for i in range(100):
+        m.put('key' + str(i), [i, str(i)])
+    m.save(path)
+    m2 = HashMap.load(path)
+    print(m2.size, m2.capacity, m2.get('key42'), m2.empty_buckets() == m.empty_buckets())
+    m3 = HashMap.load(path, hash_function_2)
+    print(m3.size, m3.capacity, m3.get('key42'), sorted(m3) == sorted(m))
+
+
+    print("\nvectorized hash example")
+    print("-----------------------")
+    if np is None:
+        print('NumPy not installed')
+    else:
+        keys = ['key' + str(i) for i in range(100)] + ['', 'r\u00f6ck']
+        for function, vectorized in VECTORIZED_HASH_FUNCTIONS.items():
+            print(vectorized(np.array(keys)).tolist() == [function(key) for key in keys])
+
+
+    print("\nbloom filter example")
+    print("--------------------")
+    for bloom_filter in ('plain', 'counting'):
+        m = HashMap(100, 'fnv1a', max_load_factor=1.0, bloom_filter=bloom_filter)
+        for i in range(1000):
+            m.put('key' + str(i), i)
+        for i in range(0, 1000, 2):
+            m.remove('key' + str(i))
+        found = sum(m.contains_key('key' + str(i)) for i in range(1000))
+        missing = sum(m.get('other' + str(i)) is None for i in range(10000))
+        stats = m.bloom_stats()
+        print(bloom_filter, found, missing, stats['keys'], stats['negatives'] + stats['false_positives'],
+              stats['observed_false_positive_rate'] < 0.05)
+
+
+    print("\nstats example")
+    print("-------------")
+    m = HashMap(10, hash_function_1, max_load_factor=2.0)
+    m.enable_stats()
+    for i in range(100):
+        m.put('key' + str(i), i)
+    for i in range(200):
+        m.get('key' + str(i))
+    m.disable_stats()
+    m.get('key0')
+    stats = m.stats()
+    print(stats['operations']['put'], stats['operations']['get'], stats['hash_time_ns']['count'])
+    print(stats['chain_walk']['get']['p50'], stats['chain_walk']['get']['max'], len(stats['resizes']))
+
+
+    print("\nkey arena example")
+    print("-----------------")
+    arena = KeyArena()
+    maps = [HashMap(8, 'fnv1a', max_load_factor=1.0, key_arena=arena) for _ in range(3)]
+    for m in maps:
+        for i in range(20):
+            m.put('field' + str(i), i)
+    maps[0].remove('field3')
+    print(arena.size, maps[0].size, maps[1].get('field7'), maps[0].contains_key('field3'),
+          sorted(maps[2].keys()) == sorted('field' + str(i) for i in range(20)))
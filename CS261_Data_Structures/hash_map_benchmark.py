@@ -0,0 +1,408 @@
+# Course: CS261 - Data Structures
+# Description: Benchmarks comparing the chained HashMap (hash_map.py) with the
+#              open addressing (hash_map_oa.py), Robin Hood (hash_map_rh.py)
+#              and cuckoo (hash_map_cuckoo.py) hash maps, the put latency of
+#              stop-the-world versus incremental resizing, the memory used per
+#              HashMap entry, the chain lengths each hash function gives,
+#              per-item versus batch put/get/remove throughput, multi-threaded
+#              throughput of the striped-lock ConcurrentHashMap versus one
+#              global lock, the list-backed DynamicArray versus the typed
+#              TypedDynamicArray, and a regression suite timing every HashMap
+#              operation across key distributions, capacities and hash
+#              functions, with JSON output.
+#
+# Usage: python hash_map_benchmark.py [engines] [resize] [memory] [hashes] [batch]
+#                                     [threads] [arrays] [suite] [number of keys ...]
+#                                     [--output FILE] [--compare FILE] [--repeat N]
+#                                     [--profile]
+
+
+import argparse
+import cProfile
+import gc
+import itertools
+import json
+import platform
+import pstats
+import random
+import string
+import sys
+import threading
+import time
+import tracemalloc
+
+from a7_include import DynamicArray, TypedDynamicArray
+from hash_map import HashMap, HASH_FUNCTIONS
+from hash_map_oa import OpenAddressHashMap
+from hash_map_rh import RobinHoodHashMap
+from hash_map_cuckoo import CuckooHashMap
+from hash_map_concurrent import ConcurrentHashMap
+
+
+def time_call(func, *args) -> float:
+    """
+    Calls func with the given arguments and returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def insert_all(m, keys: list) -> None:
+    """ Puts every key into the map with the key as its value """
+    for key in keys:
+        m.put(key, key)
+
+
+def lookup_all(m, keys: list) -> None:
+    """ Gets every key from the map """
+    for key in keys:
+        m.get(key)
+
+
+def delete_all(m, keys: list) -> None:
+    """ Removes every key from the map """
+    for key in keys:
+        m.remove(key)
+
+
+def compare_engines(n: int) -> None:
+    """
+    Runs insert/lookup/delete of n keys against each of the four hash map
+    engines (chained, open addressing, Robin Hood and cuckoo) and prints the
+    time taken by each phase.
+
+    All engines use the built-in hash(): the sample hash functions collapse a
+    million keys into a few thousand hash values, which would only measure
+    the hash function rather than the table layout.
+    """
+    keys = ['key' + str(i) for i in range(n)]
+
+    print('engine'.ljust(20), 'insert'.rjust(10), 'lookup'.rjust(10), 'delete'.rjust(10))
+    for name, engine in [('chained', HashMap), ('open addressing', OpenAddressHashMap),
+                         ('robin hood', RobinHoodHashMap), ('cuckoo', CuckooHashMap)]:
+        # chained map is sized for a load factor of 1 since it never grows itself
+        m = engine(n if engine is HashMap else 16, hash)
+        results = [time_call(insert_all, m, keys),
+                   time_call(lookup_all, m, keys),
+                   time_call(delete_all, m, keys)]
+        print(name.ljust(20), *[('%.3fs' % t).rjust(10) for t in results])
+
+
+def resize_latency(n: int) -> None:
+    """
+    Puts n keys into a self-resizing HashMap with and without incremental
+    resizing and prints the total time and the slowest single put.
+
+    The garbage collector is paused while timing (as timeit does), otherwise
+    the worst put is a full collection pass rather than a resize.
+    """
+    keys = ['key' + str(i) for i in range(n)]
+    gc.disable()
+
+    print('resize mode'.ljust(20), 'total'.rjust(10), 'worst put'.rjust(10), 'resizes'.rjust(10))
+    for name, incremental in [('stop-the-world', False), ('incremental', True)]:
+        m = HashMap(16, hash, max_load_factor=1.0, incremental_resize=incremental)
+        worst = 0.0
+        start = time.perf_counter()
+        for key in keys:
+            put_start = time.perf_counter()
+            m.put(key, key)
+            worst = max(worst, time.perf_counter() - put_start)
+        total = time.perf_counter() - start
+        print(name.ljust(20), ('%.3fs' % total).rjust(10), ('%.2fms' % (worst * 1000)).rjust(10),
+              str(m.resize_count).rjust(10))
+    gc.enable()
+
+
+def memory_per_entry(n: int) -> None:
+    """
+    Measures with tracemalloc the memory allocated by a HashMap holding n
+    entries (nodes, buckets and bucket array - not the keys themselves)
+    and prints it divided by n.
+    """
+    keys = ['key' + str(i) for i in range(n)]
+
+    tracemalloc.start()
+    m = HashMap(n, hash)
+    for key in keys:
+        m.put(key, key)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print('entries'.ljust(20), str(n).rjust(10))
+    print('bytes per entry'.ljust(20), ('%.1f' % (allocated / n)).rjust(10))
+
+
+def chain_lengths(n: int) -> None:
+    """
+    Puts n 'keyN' style keys into a HashMap with n buckets for every hash
+    function in HASH_FUNCTIONS and prints the resulting chain length
+    distribution (share of empty buckets, longest chain, and the average
+    chain a successful lookup has to walk).
+    """
+    keys = ['key' + str(i) for i in range(n)]
+
+    print('hash function'.ljust(20), 'time'.rjust(10), 'empty'.rjust(10), 'longest'.rjust(10),
+          'avg walk'.rjust(10))
+    for name in HASH_FUNCTIONS:
+        m = HashMap(n, name)
+        elapsed = time_call(insert_all, m, keys)
+        distribution = m.chain_length_distribution()
+
+        # a key in a chain of length L is found after (L + 1) / 2 nodes on average
+        walked = sum(count * length * (length + 1) / 2 for length, count in distribution.items())
+        print(name.ljust(20), ('%.3fs' % elapsed).rjust(10),
+              ('%.1f%%' % (100 * distribution.get(0, 0) / n)).rjust(10),
+              str(max(distribution)).rjust(10), ('%.1f' % (walked / n)).rjust(10))
+
+
+def batch_throughput(n: int) -> None:
+    """
+    Loads, reads and deletes n keys in a self-resizing HashMap, once with a
+    put/get/remove call per key and once with put_many/get_many/remove_many,
+    and prints the keys per second of each phase.
+    """
+    keys = ['key' + str(i) for i in range(n)]
+    pairs = [(key, key) for key in keys]
+
+    print('api'.ljust(20), 'put/s'.rjust(10), 'get/s'.rjust(10), 'remove/s'.rjust(10))
+    for name in ['per item', 'batch']:
+        m = HashMap(16, 'fnv1a', max_load_factor=1.0, min_load_factor=0.25)
+        if name == 'batch':
+            results = [time_call(m.put_many, pairs), time_call(m.get_many, keys),
+                       time_call(m.remove_many, keys)]
+        else:
+            results = [time_call(insert_all, m, keys), time_call(lookup_all, m, keys),
+                       time_call(delete_all, m, keys)]
+        print(name.ljust(20), *[('%d' % (n / t)).rjust(10) for t in results])
+
+
+def thread_throughput(n: int) -> None:
+    """
+    Splits n put/get pairs over 1, 4 and 16 threads and prints the operations
+    per second for a HashMap behind one global lock and for a
+    ConcurrentHashMap with 16 lock stripes.
+    """
+    keys = ['key' + str(i) for i in range(n)]
+
+    def run(thread_count: int, put, get) -> float:
+        chunk = -(-n // thread_count)
+
+        def worker(part: list) -> None:
+            for key in part:
+                put(key, key)
+                get(key)
+
+        threads = [threading.Thread(target=worker, args=(keys[i * chunk:(i + 1) * chunk],))
+                   for i in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    print('map'.ljust(20), *[(str(t) + ' threads').rjust(12) for t in (1, 4, 16)])
+    for name in ['global lock', 'lock stripes']:
+        results = []
+        for thread_count in (1, 4, 16):
+            if name == 'global lock':
+                m, lock = HashMap(16, 'fnv1a', max_load_factor=1.0), threading.Lock()
+
+                def put(key, value, m=m, lock=lock):
+                    with lock:
+                        m.put(key, value)
+
+                def get(key, m=m, lock=lock):
+                    with lock:
+                        return m.get(key)
+            else:
+                m = ConcurrentHashMap(16, 'fnv1a', stripes=16)
+                put, get = m.put, m.get
+            results.append(2 * n / run(thread_count, put, get))
+        print(name.ljust(20), *[('%d/s' % ops).rjust(12) for ops in results])
+
+
+def typed_arrays(n: int) -> None:
+    """
+    Fills a DynamicArray and a TypedDynamicArray of 64 bit integers with n
+    numbers one append at a time and with one bulk call, reads them all
+    back with get_at_index, and prints the times and the memory used per
+    element.
+    """
+    numbers = list(range(n))
+
+    def append_all(arr) -> None:
+        for number in numbers:
+            arr.append(number)
+
+    def read_all(arr) -> None:
+        for i in range(n):
+            arr.get_at_index(i)
+
+    print('array'.ljust(20), 'append'.rjust(10), 'bulk'.rjust(10), 'read'.rjust(10), 'bytes/item'.rjust(12))
+    for name, make, bulk in [('DynamicArray', DynamicArray, DynamicArray),
+                             ('TypedDynamicArray', TypedDynamicArray,
+                              lambda values: TypedDynamicArray(values))]:
+        arr = make()
+        results = [time_call(append_all, arr), time_call(bulk, numbers), time_call(read_all, arr)]
+
+        # the list holds pointers to int objects (shared with numbers here, but
+        # separate objects in real use), the typed array holds the values themselves
+        tracemalloc.start()
+        arr = make()
+        append_all(arr)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if name == 'DynamicArray':
+            memory += sum(sys.getsizeof(number) for number in numbers)
+        print(name.ljust(20), *[('%.3fs' % t).rjust(10) for t in results], ('%.1f' % (memory / n)).rjust(12))
+
+
+def sequential_keys(n: int) -> list:
+    """ Returns n sequential ID keys: 'id0', 'id1', ... """
+    return ['id' + str(i) for i in range(n)]
+
+
+def random_keys(n: int, seed: int = 261) -> list:
+    """
+    Returns n distinct random lowercase keys of 6 to 12 letters, the same
+    ones (in the same order) on every run
+    """
+    rng = random.Random(seed)
+    keys = {}
+    while len(keys) < n:
+        keys[''.join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))] = None
+    return list(keys)
+
+
+def anagram_keys(n: int) -> list:
+    """
+    Returns n distinct permutations of 'abcdefghijkl'. They all have the
+    same hash_function_1 value, so with it every key lands in one chain.
+    """
+    return [''.join(letters) for letters in itertools.islice(itertools.permutations('abcdefghijkl'), n)]
+
+
+KEY_DISTRIBUTIONS = {'sequential': sequential_keys, 'random': random_keys, 'anagrams': anagram_keys}
+SUITE_OPERATIONS = ('put', 'get', 'get_keys', 'resize', 'remove')
+
+
+def run_suite(n: int, repeat: int = 1) -> list:
+    """
+    Times put, get, get_keys, resize_table (to twice the capacity) and
+    remove of n keys for every key distribution, for a HashMap with n / 100
+    and with n buckets (no automatic resizing), and for every hash function
+    in HASH_FUNCTIONS. Each measurement is the fastest of repeat runs.
+
+    Prints one line per configuration and returns a list with one
+    dictionary per measurement (distribution, capacity, hash_function,
+    operation, n, seconds, ops_per_second, longest_chain).
+    """
+    results = []
+    print('keys'.ljust(11), 'capacity'.rjust(9), 'hash function'.ljust(16),
+          *[operation.rjust(9) for operation in SUITE_OPERATIONS], 'longest'.rjust(8))
+
+    for distribution, make_keys in KEY_DISTRIBUTIONS.items():
+        keys = make_keys(n)
+        for capacity in (max(n // 100, 1), n):
+            for function in HASH_FUNCTIONS:
+                times = {operation: [] for operation in SUITE_OPERATIONS}
+                for _ in range(repeat):
+                    m = HashMap(capacity, function)
+                    times['put'].append(time_call(insert_all, m, keys))
+                    times['get'].append(time_call(lookup_all, m, keys))
+                    times['get_keys'].append(time_call(m.get_keys))
+                    longest = max(m.chain_length_distribution())
+                    times['resize'].append(time_call(m.resize_table, capacity * 2))
+                    times['remove'].append(time_call(delete_all, m, keys))
+
+                for operation in SUITE_OPERATIONS:
+                    seconds = min(times[operation])
+                    # resize_table and get_keys are one call over all n keys
+                    results.append({'distribution': distribution, 'capacity': capacity,
+                                    'hash_function': function, 'operation': operation, 'n': n,
+                                    'seconds': seconds, 'ops_per_second': n / seconds if seconds else None,
+                                    'longest_chain': longest})
+                print(distribution.ljust(11), str(capacity).rjust(9), function.ljust(16),
+                      *[('%.4f' % min(times[operation])).rjust(9) for operation in SUITE_OPERATIONS],
+                      str(longest).rjust(8))
+
+    return results
+
+
+def compare_results(old: list, new: list, threshold: float = 1.1) -> None:
+    """
+    Prints every measurement of new that took more than threshold times as
+    long as the same measurement in old (e.g. an earlier release's --output
+    file), or a note that there are none.
+    """
+    def measurement(result: dict) -> tuple:
+        return (result['distribution'], result['capacity'], result['hash_function'],
+                result['operation'], result['n'])
+
+    old_seconds = {measurement(result): result['seconds'] for result in old}
+    slower = 0
+    for result in new:
+        before = old_seconds.get(measurement(result))
+        if before and result['seconds'] > before * threshold:
+            slower += 1
+            print('slower:', *measurement(result), '%.4fs -> %.4fs (x%.2f)'
+                  % (before, result['seconds'], result['seconds'] / before))
+    if slower == 0:
+        print('no measurement more than x%.2f slower' % threshold)
+
+
+if __name__ == "__main__":
+    benchmarks = {'engines': compare_engines, 'resize': resize_latency, 'memory': memory_per_entry,
+                  'hashes': chain_lengths, 'batch': batch_throughput, 'threads': thread_throughput,
+                  'arrays': typed_arrays, 'suite': None}
+
+    parser = argparse.ArgumentParser(description='HashMap benchmarks (default: engines resize)')
+    parser.add_argument('args', nargs='*', metavar='benchmark | n',
+                        help='benchmarks to run (' + ', '.join(benchmarks) + ') and numbers of keys '
+                             '(default 10000 for suite, 1000000 for the others)')
+    parser.add_argument('--output', help='write the suite results to this JSON file')
+    parser.add_argument('--compare', help='suite JSON file of an earlier run to report slowdowns against')
+    parser.add_argument('--repeat', type=int, default=1, help='suite runs per measurement (the fastest is kept)')
+    parser.add_argument('--profile', action='store_true', help='profile the benchmarks and print the top functions')
+    options = parser.parse_args()
+
+    for arg in options.args:
+        if arg not in benchmarks and not arg.isdigit():
+            parser.error('unknown benchmark ' + arg)
+    names = [arg for arg in options.args if arg in benchmarks] or ['engines', 'resize']
+    sizes = [int(arg) for arg in options.args if arg.isdigit()]
+
+    profiler = cProfile.Profile() if options.profile else None
+    if profiler is not None:
+        profiler.enable()
+
+    suite_results = []
+    for name in names:
+        for n in sizes or [10000 if name == 'suite' else 1000000]:
+            if name == 'suite':
+                suite_results.extend(run_suite(n, options.repeat))
+            else:
+                benchmarks[name](n)
+            print()
+
+    if profiler is not None:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+
+    # read the baseline before writing the output, which may be the same file
+    if options.compare and suite_results:
+        with open(options.compare) as in_file:
+            baseline = json.load(in_file)['results']
+
+    if options.output and suite_results:
+        with open(options.output, 'w') as out_file:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(),
+                       'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': options.repeat,
+                       'results': suite_results}, out_file, indent=2)
+        print('wrote', len(suite_results), 'results to', options.output)
+
+    if options.compare and suite_results:
+        compare_results(baseline, suite_results)
@@ -0,0 +1,335 @@
+# Course: CS261 - Data Structures
+# Description: Bounded caches built on the chained HashMap. The HashMap finds a
+#              key's node in O(1); the nodes are also linked into intrusive
+#              doubly linked lists that order them for eviction - by recency
+#              (LRUCache) or by use count, then recency (LFUCache).
+
+
+import sys
+
+# Import the chained HashMap
+from hash_map import HashMap
+
+
+class CacheNode:
+    """
+    Doubly Linked List Node holding one cache entry. The node is stored as
+    the HashMap value for its key and linked into the eviction order.
+    """
+
+    __slots__ = ('prev', 'next', 'key', 'value', 'nbytes', 'count')
+
+    def __init__(self, key: str, value: object, nbytes: int) -> None:
+        """ Init new unlinked node (count is the number of uses, for LFU) """
+        self.prev = None
+        self.next = None
+        self.key = key
+        self.value = value
+        self.nbytes = nbytes
+        self.count = 1
+
+
+class RecencyList:
+    """
+    Circular Doubly Linked List of CacheNode objects with a sentinel node.
+    The front holds the most recently used node, the back the least.
+    Supported methods are: push_front, unlink, back, length
+    """
+
+    __slots__ = ('sentinel', 'size')
+
+    def __init__(self) -> None:
+        """ Init new empty list """
+        self.sentinel = CacheNode(None, None, 0)
+        self.sentinel.prev = self.sentinel.next = self.sentinel
+        self.size = 0
+
+    def push_front(self, node: CacheNode) -> None:
+        """ Link an unlinked node in at the front of the list """
+        node.prev, node.next = self.sentinel, self.sentinel.next
+        self.sentinel.next.prev = node
+        self.sentinel.next = node
+        self.size += 1
+
+    def unlink(self, node: CacheNode) -> None:
+        """ Remove a node that is in this list from it """
+        node.prev.next, node.next.prev = node.next, node.prev
+        node.prev = node.next = None
+        self.size -= 1
+
+    def back(self) -> CacheNode:
+        """ Return the node at the back of the list, or None if it is empty """
+        return None if self.size == 0 else self.sentinel.prev
+
+    def length(self) -> int:
+        """ Return the length of the list """
+        return self.size
+
+
+class LRUCache:
+    """
+    Cache that holds at most max_entries entries and (approximately)
+    max_bytes bytes, evicting the least recently used entries to stay
+    within both limits. Either limit may be None (unbounded). An entry
+    larger than max_bytes by itself is not kept, and evicts nothing.
+
+    The size of an entry is sizeof(key) + sizeof(value), with sizeof
+    defaulting to sys.getsizeof (which does not follow references, so pass
+    a better estimate for nested values). get/put/remove are O(1).
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, sizeof=sys.getsizeof,
+                 function='fnv1a') -> None:
+        """
+        Init new empty cache. function is the hash function of the
+        underlying HashMap.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._map = HashMap(16, function, max_load_factor=1.0, min_load_factor=0.25)
+        self._order = RecencyList()
+
+        self.size = 0
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """ Return the number of entries in the cache """
+        return self.size
+
+    def _touch(self, node: CacheNode) -> None:
+        """ Moves a node that was just used to the front of the eviction order """
+        self._order.unlink(node)
+        self._order.push_front(node)
+
+    def _link(self, node: CacheNode) -> None:
+        """ Links a new node into the eviction order """
+        self._order.push_front(node)
+
+    def _unlink(self, node: CacheNode) -> None:
+        """ Removes a node from the eviction order """
+        self._order.unlink(node)
+
+    def _victim(self) -> CacheNode:
+        """ Returns the node to evict next """
+        return self._order.back()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value cached for the given key and marks it as used.
+        If the key is not cached, returns None.
+        """
+        node = self._map.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        node.count += 1
+        self._touch(node)
+        return node.value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Caches value for the given key (replacing any cached value) as the
+        most recently used entry, then evicts entries until the cache is
+        within its limits again.
+        """
+        nbytes = self.sizeof(key) + self.sizeof(value)
+        node = self._map.get(key)
+
+        # an entry larger than max_bytes on its own is never kept - it only
+        # drops the stale value cached for its key, and evicts nothing else
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            if node is not None:
+                self._remove_node(node)
+            return None
+
+        if node is not None:
+            self.nbytes += nbytes - node.nbytes
+            node.value, node.nbytes = value, nbytes
+            node.count += 1
+            self._touch(node)
+            # a larger value may have pushed the cache over max_bytes
+            self._evict()
+        else:
+            # make room first, so a new entry is never its own victim
+            self._evict(1, nbytes)
+            node = CacheNode(key, value, nbytes)
+            self._map.put(key, node)
+            self._link(node)
+            self.size += 1
+            self.nbytes += nbytes
+
+    def _evict(self, entries: int = 0, nbytes: int = 0) -> None:
+        """
+        Evicts entries until the given number of entries and bytes could be
+        added without breaking either limit
+        """
+        while self.size > 0 and (
+                (self.max_entries is not None and self.size + entries > self.max_entries) or
+                (self.max_bytes is not None and self.nbytes + nbytes > self.max_bytes)):
+            self._remove_node(self._victim())
+            self.evictions += 1
+
+    def _remove_node(self, node: CacheNode) -> None:
+        """ Drops a cached node from the map and the eviction order """
+        self._map.remove(node.key)
+        self._unlink(node)
+        self.size -= 1
+        self.nbytes -= node.nbytes
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key from the cache. Does nothing if it is not cached.
+        """
+        node = self._map.get(key)
+        if node is not None:
+            self._remove_node(node)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is cached, otherwise False. Does not
+        count as a use of the key.
+        """
+        return self._map.contains_key(key)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache. The counters are kept.
+        """
+        self._map.clear()
+        self._order = RecencyList()
+        self.size = 0
+        self.nbytes = 0
+
+    def hit_rate(self) -> float:
+        """ Returns hits / (hits + misses), or 0.0 before the first get """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LFUCache(LRUCache):
+    """
+    Cache with the same interface and limits as LRUCache that evicts the
+    least frequently used entry instead (the least recently used one among
+    entries with the same use count). get/put/remove are O(1): nodes are
+    kept in one RecencyList per use count, and the lowest count that has a
+    list is tracked. Only a remove() of the last node with the lowest count
+    makes the next eviction look for the new lowest count, which takes
+    O(number of distinct counts).
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, sizeof=sys.getsizeof,
+                 function='fnv1a') -> None:
+        """
+        Init new empty cache. function is the hash function of the
+        underlying HashMaps.
+        """
+        super().__init__(max_entries, max_bytes, sizeof, function)
+        self._lists = HashMap(16, 'builtin', max_load_factor=1.0)
+        self._min_count = 0
+
+    def _list(self, count: int) -> RecencyList:
+        """ Returns the list of nodes used count times, creating it if needed """
+        nodes = self._lists.get(count)
+        if nodes is None:
+            nodes = RecencyList()
+            self._lists.put(count, nodes)
+        return nodes
+
+    def _touch(self, node: CacheNode) -> None:
+        """ Moves a node whose count was just raised to the list for its new count """
+        old_list = self._lists.get(node.count - 1)
+        old_list.unlink(node)
+        if old_list.length() == 0:
+            self._lists.remove(node.count - 1)
+            if self._min_count == node.count - 1:
+                self._min_count = node.count
+        self._list(node.count).push_front(node)
+
+    def _link(self, node: CacheNode) -> None:
+        """ Links a new node (count 1) into the eviction order """
+        self._list(1).push_front(node)
+        self._min_count = 1
+
+    def _unlink(self, node: CacheNode) -> None:
+        """ Removes a node from the eviction order """
+        nodes = self._lists.get(node.count)
+        nodes.unlink(node)
+        if nodes.length() == 0:
+            self._lists.remove(node.count)
+
+    def _victim(self) -> CacheNode:
+        """ Returns the least recently used node with the lowest count """
+        nodes = self._lists.get(self._min_count)
+        if nodes is None:
+            # the lowest list was emptied by a remove() or an earlier eviction;
+            # no list has a count below _min_count, so the scan is only needed
+            # here - an eviction that makes room for a new key is followed by
+            # _link(), which sets the lowest count to 1 without one
+            self._min_count = min(self._lists.keys())
+            nodes = self._lists.get(self._min_count)
+        return nodes.back()
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache. The counters are kept.
+        """
+        super().clear()
+        self._lists.clear()
+        self._min_count = 0
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nLRU")
+    print("---")
+    c = LRUCache(max_entries=3)
+    for key in ['a', 'b', 'c']:
+        c.put(key, key.upper())
+    c.get('a')
+    c.put('d', 'D')                 # evicts b - least recently used
+    print(c.get('b'), c.get('a'), c.get('c'), c.get('d'), len(c))
+    print(c.hits, c.misses, c.evictions, round(c.hit_rate(), 2))
+
+    c = LRUCache(max_bytes=1000, sizeof=len)
+    for i in range(10):
+        c.put('k' + str(i), 'x' * 200)
+    print(len(c), c.nbytes, c.contains_key('k0'), c.contains_key('k9'), c.evictions)
+    c.put('k9', 'x' * 5000)         # too large - drops the old k9 only
+    print(len(c), c.contains_key('k9'), c.contains_key('k8'), c.evictions)
+
+    print("\nLFU")
+    print("---")
+    c = LFUCache(max_entries=3)
+    for key in ['a', 'b', 'c']:
+        c.put(key, key.upper())
+    c.get('a')
+    c.get('a')
+    c.get('b')
+    c.put('d', 'D')                 # evicts c - used least often
+    print(c.get('c'), c.get('a'), c.get('b'), c.get('d'), len(c))
+    c.put('e', 'E')                 # evicts d - the lowest count (2) left
+    print(c.contains_key('d'), c.contains_key('b'), c.contains_key('e'), c.evictions)
+
+    print("\nLFU put cost vs number of distinct counts")
+    print("-----------------------------------------")
+    import time
+    costs = []
+    for counts in (10, 200, 2000):
+        c = LFUCache(max_entries=2000)
+        for i in range(2000):
+            c.put('k' + str(i), i)
+            for _ in range(i % counts):
+                c.get('k' + str(i))
+        start = time.perf_counter()
+        for i in range(5000):
+            c.put('new' + str(i), i)    # each new key evicts the previous one
+        costs.append((time.perf_counter() - start) / 5000)
+    # with O(1) puts the cost does not grow with the number of counts
+    print(len(c), c.evictions, max(costs) < 3 * min(costs))
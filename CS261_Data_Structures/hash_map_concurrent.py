@@ -0,0 +1,210 @@
+# Course: CS261 - Data Structures
+# Description: Thread-safe Hash Map built from lock stripes. The buckets are
+#              split across several independent HashMap segments, each guarded
+#              by its own lock, so threads working on keys in different
+#              segments do not wait for each other.
+
+
+import threading
+
+# Import pre-written DynamicArray class and the chained HashMap
+from a7_include import *
+from hash_map import HashMap, hash_function_1, hash_function_fnv1a
+
+
+class ConcurrentHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap that can be
+    shared between threads without an external lock.
+
+    A key's stripe is picked with Python's built-in hash() (cheap, and
+    unrelated to the bucket index the segment computes with the map's own
+    hash function). Each stripe is a self-resizing HashMap with its own lock.
+    Operations on the whole map (clear, resize_table, get_keys,
+    empty_buckets) take every stripe lock, always in stripe order, so they
+    cannot deadlock with each other.
+    """
+
+    def __init__(self, capacity: int, function, stripes: int = 16,
+                 max_load_factor: float = 1.0) -> None:
+        """
+        Init new concurrent HashMap with (about) the given number of buckets
+        split evenly across the given number of lock stripes
+        """
+        if stripes < 1:
+            raise ValueError('stripes must be at least 1')
+        self.hash_function = function
+        self.stripes = stripes
+        segment_capacity = max(-(-capacity // stripes), 1)
+        self._segments = [HashMap(segment_capacity, function, max_load_factor=max_load_factor)
+                          for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form, stripe by stripe
+        """
+        out = ''
+        for i in range(self.stripes):
+            with self._locks[i]:
+                out += 'stripe ' + str(i) + ':\n' + str(self._segments[i])
+        return out
+
+    @property
+    def size(self) -> int:
+        """
+        Number of key:value pairs in the hash map. Stripes are read one
+        after another, so with concurrent writers this is a snapshot.
+        """
+        return sum(segment.size for segment in self._segments)
+
+    @property
+    def capacity(self) -> int:
+        """ Total number of buckets across all stripes """
+        return sum(segment.capacity for segment in self._segments)
+
+    def _stripe(self, key: str) -> int:
+        """ Returns the stripe number the given key belongs to """
+        return hash(key) % self.stripes
+
+    def _lock_all(self) -> None:
+        """ Acquires every stripe lock in stripe order """
+        for lock in self._locks:
+            lock.acquire()
+
+    def _unlock_all(self) -> None:
+        """ Releases every stripe lock """
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def clear(self) -> None:
+        """
+        Removes every key:value pair from the hash map. Returns nothing.
+        """
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                segment.clear()
+        finally:
+            self._unlock_all()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._segments[stripe].get(key)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, only its value is replaced.
+        """
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._segments[stripe].put(key, value)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        Does nothing if the key is not present.
+        """
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._segments[stripe].remove(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._segments[stripe].contains_key(key)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of buckets, across all stripes, that hold no nodes.
+        """
+        self._lock_all()
+        try:
+            return sum(segment.empty_buckets() for segment in self._segments)
+        finally:
+            self._unlock_all()
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/total number of buckets).
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes every stripe so that together they have (about) the given
+        number of buckets. Does nothing if new_capacity < 1.
+        """
+        if new_capacity < 1:
+            return None
+
+        segment_capacity = max(-(-new_capacity // self.stripes), 1)
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                segment.resize_table(segment_capacity)
+        finally:
+            self._unlock_all()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        self._lock_all()
+        try:
+            for segment in self._segments:
+                for key in segment.keys():
+                    temp_da.append(key)
+        finally:
+            self._unlock_all()
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = ConcurrentHashMap(16, hash_function_1, stripes=4)
+    for i in range(25):
+        m.put('key' + str(i), i * 10)
+    print(m.size, m.capacity, m.get('key3'), m.contains_key('key24'), m.contains_key('x'))
+    m.remove('key3')
+    print(m.size, m.get('key3'), m.get_keys().length())
+
+    print("\nmulti-threaded stress test")
+    print("--------------------------")
+    m = ConcurrentHashMap(16, hash_function_fnv1a, stripes=8)
+    thread_count, per_thread = 8, 2000
+
+    def worker(number: int) -> None:
+        # every thread writes its own keys, and all threads fight over 'shared'
+        for i in range(per_thread):
+            m.put('t' + str(number) + '-' + str(i), i)
+            m.put('shared' + str(i % 50), number)
+            if i % 2 == 0:
+                m.remove('t' + str(number) + '-' + str(i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = m.size == thread_count * per_thread // 2 + 50
+    for n in range(thread_count):
+        for i in range(per_thread):
+            result &= m.contains_key('t' + str(n) + '-' + str(i)) == (i % 2 == 1)
+    print(result, m.size, m.get_keys().length(), m.get('shared0') in range(thread_count))
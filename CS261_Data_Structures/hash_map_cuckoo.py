@@ -0,0 +1,287 @@
+# Course: CS261 - Data Structures
+# Description: Implementation of a Hash Map Abstract Data Type with collision
+#              resolution using cuckoo hashing. Every key can only live in one
+#              slot of each of two tables, so get/contains_key inspect at most
+#              two slots no matter how full the map is.
+
+
+import random
+
+# Import pre-written DynamicArray class and the hash functions
+from a7_include import *
+from hash_map import hash_function_1, hash_function_fnv1a, _MASK_64, _FNV_OFFSET_BASIS, _FNV_PRIME
+
+
+def seeded_hash(key: str, seed: int) -> int:
+    """
+    FNV-1a of the UTF-8 encoded key started from a seed dependent state,
+    followed by the splitmix64 finalizer so that every output bit depends
+    on every input bit. Different seeds give unrelated hash functions.
+    """
+    hash = _FNV_OFFSET_BASIS ^ seed
+    for byte in key.encode():
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
+    hash = ((hash ^ (hash >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    hash = ((hash ^ (hash >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return hash ^ (hash >> 31)
+
+
+class CuckooHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap.
+
+    The first table is indexed with the map's hash function and the second
+    with seeded_hash() under a random seed. Entries are stored as
+    (key, value, hash 1, hash 2) tuples. A new key evicts whatever is in its
+    slot, and the evicted entry moves to its slot in the other table, and so
+    on. If that chain runs longer than MAX_KICKS (a cycle), a new seed is
+    drawn and every entry is placed again; the tables also double in size
+    once the load factor would exceed MAX_LOAD_FACTOR.
+
+    The hash function should spread keys well (e.g. hash_function_fnv1a):
+    keys with identical first hashes all compete for one slot of the first
+    table and have to fit in the second one.
+    """
+
+    MAX_LOAD_FACTOR = 0.45
+    MAX_KICKS = 64
+
+    def __init__(self, capacity: int, function=hash_function_fnv1a) -> None:
+        """
+        Init new cuckoo HashMap with (about) the given total number of slots,
+        split evenly between the two tables
+        """
+        self.hash_function = function
+        self.size = 0
+        # number of times an insertion cycle forced a new seed
+        self.rehash_count = 0
+        self._table_size = max((capacity + 1) // 2, 1)
+        self.capacity = self._table_size * 2
+        self._seed = random.getrandbits(64)
+        self._tables = [[None] * self._table_size, [None] * self._table_size]
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form
+        """
+        out = ''
+        for t in range(2):
+            for i in range(self._table_size):
+                entry = self._tables[t][i]
+                content = 'EMPTY' if entry is None else '(' + str(entry[0]) + ': ' + str(entry[1]) + ')'
+                out += str(t) + '.' + str(i) + ': ' + content + '\n'
+        return out
+
+    def _find(self, key: str) -> tuple:
+        """
+        Returns (table number, index) of the slot holding the given key, or
+        None if the key is not in the hash map. Inspects at most two slots.
+        """
+        table_size = self._table_size
+
+        index = self.hash_function(key) % table_size
+        entry = self._tables[0][index]
+        if entry is not None and entry[0] == key:
+            return 0, index
+
+        index = seeded_hash(key, self._seed) % table_size
+        entry = self._tables[1][index]
+        if entry is not None and entry[0] == key:
+            return 1, index
+
+        return None
+
+    def _insert_entry(self, entry: tuple) -> tuple:
+        """
+        Places an entry whose key is not in the hash map, evicting entries
+        into their slot of the other table as needed. Returns None on
+        success, or the entry left without a slot after MAX_KICKS evictions.
+        """
+        tables, table_size = self._tables, self._table_size
+
+        # use a free slot in either table right away if there is one
+        for t in range(2):
+            index = entry[2 + t] % table_size
+            if tables[t][index] is None:
+                tables[t][index] = entry
+                return None
+
+        # otherwise take the slot in the first table and move the evicted entries along
+        t = 0
+        for _ in range(self.MAX_KICKS):
+            index = entry[2 + t] % table_size
+            entry, tables[t][index] = tables[t][index], entry
+            if entry is None:
+                return None
+            t ^= 1
+
+        return entry
+
+    def _entries(self) -> list:
+        """ Returns a list of every entry tuple in the hash map """
+        return [entry for table in self._tables for entry in table if entry is not None]
+
+    def _rebuild(self, table_size: int, entries: list, reseed: bool) -> None:
+        """
+        Replaces both tables with empty ones of the given size and places
+        every given entry again. Draws a new seed for the second table
+        (rehashing every key with it) whenever placement fails, and doubles
+        the table size after every few failed seeds.
+        """
+        failures = 0
+        while True:
+            if reseed:
+                self._seed = random.getrandbits(64)
+                entries = [(key, value, hash_1, seeded_hash(key, self._seed))
+                           for key, value, hash_1, _ in entries]
+
+            self._table_size = table_size
+            self.capacity = table_size * 2
+            self._tables = [[None] * table_size, [None] * table_size]
+
+            placed = True
+            for entry in entries:
+                if self._insert_entry(entry) is not None:
+                    placed = False
+                    break
+            if placed:
+                return None
+
+            # a cycle - try another seed, and more room if seeds keep failing
+            reseed = True
+            self.rehash_count += 1
+            failures += 1
+            if failures % 4 == 0:
+                table_size *= 2
+
+    def clear(self) -> None:
+        """
+        Empties both tables and sets hash map size to 0.
+        Capacity is unchanged. Returns nothing.
+        """
+        self._tables = [[None] * self._table_size, [None] * self._table_size]
+        self.size = 0
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        if self.size == 0:
+            return None
+
+        slot = self._find(key)
+        if slot is None:
+            return None
+        return self._tables[slot[0]][slot[1]][1]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, only its value is replaced.
+        """
+        hash_1 = self.hash_function(key)
+        hash_2 = seeded_hash(key, self._seed)
+        table_size = self._table_size
+
+        # key already present - replace only the value
+        for t, key_hash in enumerate((hash_1, hash_2)):
+            index = key_hash % table_size
+            entry = self._tables[t][index]
+            if entry is not None and entry[0] == key:
+                self._tables[t][index] = (key, value, entry[2], entry[3])
+                return None
+
+        entry = (key, value, hash_1, hash_2)
+        if (self.size + 1) / self.capacity > self.MAX_LOAD_FACTOR:
+            self._rebuild(table_size * 2, self._entries() + [entry], False)
+        else:
+            homeless = self._insert_entry(entry)
+            if homeless is not None:
+                self._rebuild(table_size, self._entries() + [homeless], True)
+
+        self.size += 1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        Does nothing if the key is not present.
+        """
+        if self.size == 0:
+            return None
+
+        slot = self._find(key)
+        if slot is not None:
+            self._tables[slot[0]][slot[1]] = None
+            self.size -= 1
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        if self.size == 0:
+            return False
+        return self._find(key) is not None
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of slots (in both tables) that do not hold an entry.
+        """
+        return self.capacity - self.size
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/number of slots in both tables).
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Places every entry into two new tables with (about) new_capacity
+        slots in total. Stored hash values are reused. Does nothing if
+        the new tables could not hold every entry.
+        """
+        table_size = (new_capacity + 1) // 2
+        if table_size < 1 or table_size * 2 < self.size:
+            return None
+        self._rebuild(table_size, self._entries(), False)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for entry in self._entries():
+            temp_da.append(entry[0])
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = CuckooHashMap(10)
+    for i in range(25):
+        m.put('key' + str(i), i * 10)
+    print(m.size, m.capacity, round(m.table_load(), 2))
+    m.put('key3', 'replaced')
+    print(m.get('key3'), m.get('key24'), m.get('missing'))
+    for i in range(0, 25, 2):
+        m.remove('key' + str(i))
+    result = True
+    for i in range(25):
+        result &= m.contains_key('key' + str(i)) == (i % 2 == 1)
+    print(result, m.size)
+
+    print("\nweak hash function")
+    print("------------------")
+    m = CuckooHashMap(10, hash_function_1)
+    for i in range(500):
+        m.put('key' + str(i), i)
+    result = True
+    for i in range(500):
+        result &= m.get('key' + str(i)) == i
+    print(result, m.size, m.capacity, m.get_keys().length())
@@ -0,0 +1,367 @@
+# Course: CS261 - Data Structures
+# Description: Persistent Hash Map stored in a memory-mapped file. The file
+#              holds a fixed-size bucket directory followed by an append-only
+#              record region, so opening an existing map is instant and a
+#              lookup only pages in the directory entry and the records of the
+#              one chain it walks.
+#
+# File layout (all integers little-endian):
+#   header     magic, capacity, size, end of used space, hash function name
+#   directory  capacity x 8 byte offset of the newest record of each chain (0 = empty)
+#   records    next offset, key hash, key length, value length, key (UTF-8), value (pickle)
+#
+# put/remove never modify a record - they append a new record (a removal is a
+# record without a value) at the head of the chain, which hides any older
+# record of the same key. resize_table() rewrites the file without the hidden
+# records.
+
+
+import mmap
+import os
+import pickle
+import struct
+
+# Import pre-written DynamicArray class and the hash functions
+from a7_include import *
+from hash_map import HASH_FUNCTIONS, PERSISTENT_HASH_FUNCTIONS, hash_function_name
+
+
+_MAGIC = b'HMAPMM01'
+_HEADER = struct.Struct('<8sQQQ32s')
+_OFFSET = struct.Struct('<Q')
+_RECORD = struct.Struct('<QQII')
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# value length marking a removal record
+_REMOVED = 0xFFFFFFFF
+
+
+class MmapHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap whose
+    contents live in a memory-mapped file and survive the process.
+
+    Opening a path that already holds a map reuses it (capacity and hash
+    function come from the file). Only one process may have a map file
+    open for writing at a time. Keys must be strings; values can be any
+    picklable object.
+    """
+
+    def __init__(self, path: str, capacity: int = 1024, function=None) -> None:
+        """
+        Opens the map stored at path, or creates an empty one with the given
+        number of buckets. function is the name of (or one of) the hash
+        functions in PERSISTENT_HASH_FUNCTIONS; if it is None, a new map
+        uses fnv1a and an existing one the function it was written with.
+        """
+        self.path = path
+        name = None if function is None else self._function_name(function)
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            if capacity < 1:
+                raise ValueError('capacity must be at least 1')
+            if name is None:
+                name = 'fnv1a'
+            self._create(path, capacity, name)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, self.capacity, self.size, self._end, stored_name = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(path + ' is not a hash map file')
+        stored_name = stored_name.rstrip(b'\0').decode()
+        if name is not None and stored_name != name:
+            raise ValueError(path + ' was written with hash function ' + stored_name)
+        self.hash_function = HASH_FUNCTIONS[stored_name]
+
+    @staticmethod
+    def _function_name(function) -> str:
+        """
+        Returns the HASH_FUNCTIONS name of the given hash function (or name),
+        raising ValueError if its values are not stable across processes.
+        """
+        name = hash_function_name(function)
+        if name not in PERSISTENT_HASH_FUNCTIONS:
+            raise ValueError('hash function must be one of ' + ', '.join(PERSISTENT_HASH_FUNCTIONS))
+        return name
+
+    @staticmethod
+    def _create(path: str, capacity: int, name: str) -> None:
+        """
+        Writes an empty map file with a zeroed bucket directory.
+        """
+        records_start = _HEADER.size + capacity * _OFFSET.size
+        with open(path, 'wb') as out_file:
+            out_file.write(_HEADER.pack(_MAGIC, capacity, 0, records_start, name.encode()))
+            # extend the file to its full size without writing the zero bytes
+            out_file.truncate(records_start + 4096)
+
+    def _write_header(self) -> None:
+        """ Stores the current size and end of used space in the file header """
+        struct.pack_into('<QQ', self._map, 16, self.size, self._end)
+
+    def __enter__(self):
+        """ Supports 'with MmapHashMap(...) as m:' """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Closes the map at the end of the with block """
+        self.close()
+
+    def flush(self) -> None:
+        """ Writes every change made so far to disk """
+        self._map.flush()
+
+    def close(self) -> None:
+        """ Flushes and closes the map file """
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form
+        """
+        out = ''
+        for i in range(self.capacity):
+            pairs = ['(' + str(key) + ': ' + str(value) + ')' for key, value in self._chain_items(i)]
+            out += str(i) + ': SLL [' + ' -> '.join(pairs) + ']\n'
+        return out
+
+    def _head(self, index: int) -> int:
+        """ Returns the offset of the newest record in the given bucket's chain """
+        return _OFFSET.unpack_from(self._map, _HEADER.size + index * _OFFSET.size)[0]
+
+    def _find(self, key_bytes: bytes, key_hash: int) -> int:
+        """
+        Returns the offset of the newest record of the given key (which may
+        be a removal record), or 0 if the chain holds no record of the key.
+        """
+        mm = self._map
+        offset = self._head(key_hash % self.capacity)
+
+        while offset != 0:
+            next_offset, record_hash, key_length, _ = _RECORD.unpack_from(mm, offset)
+            if record_hash == key_hash and key_length == len(key_bytes):
+                start = offset + _RECORD.size
+                if mm[start:start + key_length] == key_bytes:
+                    return offset
+            offset = next_offset
+
+        return 0
+
+    def _is_live(self, offset: int) -> bool:
+        """ Returns True if there is a record at offset and it is not a removal """
+        return offset != 0 and _RECORD.unpack_from(self._map, offset)[3] != _REMOVED
+
+    def _read_value(self, offset: int) -> object:
+        """ Unpickles the value of the record at offset """
+        _, _, key_length, value_length = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size + key_length
+        return pickle.loads(self._map[start:start + value_length])
+
+    def _append(self, key_bytes: bytes, key_hash: int, value_bytes: bytes) -> None:
+        """
+        Appends a record at the end of the used space and makes it the head
+        of its bucket's chain. value_bytes None appends a removal record.
+        """
+        value_length = _REMOVED if value_bytes is None else len(value_bytes)
+        record_length = _RECORD.size + len(key_bytes) + (0 if value_bytes is None else len(value_bytes))
+
+        # grow the file (doubling) when the record does not fit
+        if self._end + record_length > len(self._map):
+            new_length = len(self._map)
+            while self._end + record_length > new_length:
+                new_length *= 2
+            self._map.close()
+            self._file.truncate(new_length)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+        # write the record completely before linking it into the chain
+        directory_slot = _HEADER.size + (key_hash % self.capacity) * _OFFSET.size
+        offset = self._end
+        _RECORD.pack_into(self._map, offset, _OFFSET.unpack_from(self._map, directory_slot)[0],
+                          key_hash, len(key_bytes), value_length)
+        start = offset + _RECORD.size
+        self._map[start:start + len(key_bytes)] = key_bytes
+        if value_bytes is not None:
+            self._map[start + len(key_bytes):start + record_length - _RECORD.size] = value_bytes
+
+        _OFFSET.pack_into(self._map, directory_slot, offset)
+        self._end = offset + record_length
+
+    def _live_records(self, index: int):
+        """
+        Generator yielding (key bytes, key hash, record offset) for the live
+        entries of one bucket's chain, skipping records hidden by newer
+        records of the same key.
+        """
+        mm = self._map
+        seen = set()
+        offset = self._head(index)
+
+        while offset != 0:
+            next_offset, key_hash, key_length, value_length = _RECORD.unpack_from(mm, offset)
+            start = offset + _RECORD.size
+            key_bytes = mm[start:start + key_length]
+            if key_bytes not in seen:
+                seen.add(key_bytes)
+                if value_length != _REMOVED:
+                    yield key_bytes, key_hash, offset
+            offset = next_offset
+
+    def _chain_items(self, index: int):
+        """
+        Generator yielding the live (key, value) pairs of one bucket's chain.
+        """
+        for key_bytes, _, offset in self._live_records(index):
+            yield key_bytes.decode(), self._read_value(offset)
+
+    def clear(self) -> None:
+        """
+        Removes every entry, zeroing the bucket directory and dropping all
+        records. Capacity is unchanged. Returns nothing.
+        """
+        records_start = _HEADER.size + self.capacity * _OFFSET.size
+        self._map[_HEADER.size:records_start] = bytes(records_start - _HEADER.size)
+        self.size = 0
+        self._end = records_start
+        self._write_header()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        if self.size == 0:
+            return None
+
+        offset = self._find(key.encode(), self.hash_function(key) & _MASK_64)
+        if not self._is_live(offset):
+            return None
+        return self._read_value(offset)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, the new record hides the old one.
+        """
+        key_bytes = key.encode()
+        key_hash = self.hash_function(key) & _MASK_64
+
+        if not self._is_live(self._find(key_bytes, key_hash)):
+            self.size += 1
+        self._append(key_bytes, key_hash, pickle.dumps(value))
+        self._write_header()
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map by appending
+        a removal record. Does nothing if the key is not present.
+        """
+        if self.size == 0:
+            return None
+
+        key_bytes = key.encode()
+        key_hash = self.hash_function(key) & _MASK_64
+        if self._is_live(self._find(key_bytes, key_hash)):
+            self._append(key_bytes, key_hash, None)
+            self.size -= 1
+            self._write_header()
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        if self.size == 0:
+            return False
+        return self._is_live(self._find(key.encode(), self.hash_function(key) & _MASK_64))
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of buckets that hold no live entry.
+        """
+        empty_count = 0
+        for i in range(self.capacity):
+            for _ in self._live_records(i):
+                break
+            else:
+                empty_count += 1
+        return empty_count
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/number of buckets).
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Rewrites the map file with the given number of buckets, keeping only
+        the newest record of every live key. Also reclaims the space of
+        replaced and removed entries when called with the current capacity.
+        Does nothing if new_capacity < 1.
+        """
+        if new_capacity < 1:
+            return None
+
+        temp_path = self.path + '.tmp'
+        name = self._function_name(self.hash_function)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        # copy the live records (stored hash and pickled value included, so
+        # nothing is hashed or unpickled) into a new file, then swap it in
+        with MmapHashMap(temp_path, new_capacity, name) as temp_map:
+            for i in range(self.capacity):
+                for key_bytes, key_hash, offset in self._live_records(i):
+                    value_length = _RECORD.unpack_from(self._map, offset)[3]
+                    start = offset + _RECORD.size + len(key_bytes)
+                    temp_map._append(key_bytes, key_hash, self._map[start:start + value_length])
+                    temp_map.size += 1
+            temp_map._write_header()
+
+        self.close()
+        os.replace(temp_path, self.path)
+        self.__init__(self.path, new_capacity, name)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for i in range(self.capacity):
+            for key_bytes, _, _ in self._live_records(i):
+                temp_da.append(key_bytes.decode())
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'example.hmap')
+
+    print("\nput / get / remove")
+    print("------------------")
+    with MmapHashMap(path, 50, 'hash_function_1') as m:
+        for i in range(200):
+            m.put('key' + str(i), {'id': i})
+        m.put('key3', 'replaced')
+        m.remove('key4')
+        print(m.size, m.capacity, m.get('key3'), m.get('key4'), m.get('key199'))
+
+    print("\nreopen")
+    print("------")
+    with MmapHashMap(path) as m:
+        print(m.size, m.capacity, m.get('key3'), m.contains_key('key4'), m.get('key10'))
+        m.resize_table(400)
+        print(m.size, m.capacity, m.get_keys().length(), m.empty_buckets(), m.get('key10'))
+        m.clear()
+        print(m.size, m.get('key3'))
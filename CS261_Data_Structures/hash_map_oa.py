@@ -0,0 +1,264 @@
+# Course: CS261 - Data Structures
+# Description: Implementation of a Hash Map Abstract Data Type with collision
+#              resolution using open addressing (linear probing with tombstones).
+#              Keys, values and hash values are kept in flat parallel arrays
+#              instead of chains of SLNode objects.
+
+
+# Import pre-written DynamicArray class and the sample hash functions
+from a7_include import *
+from hash_map import hash_function_1, hash_function_2
+
+
+# marker left in a slot whose entry was removed so that probe sequences
+# passing through the slot are not cut short
+_TOMBSTONE = object()
+
+
+class OpenAddressHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap that resolves
+    collisions with linear probing. Grows itself whenever the share of used
+    slots (live entries plus tombstones) exceeds MAX_LOAD_FACTOR.
+    """
+
+    MAX_LOAD_FACTOR = 0.5
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Init new open addressing HashMap with the given number of slots
+        """
+        self.capacity = capacity
+        self.hash_function = function
+        self.size = 0
+        self._tombstones = 0
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form
+        """
+        out = ''
+        for i in range(self.capacity):
+            key = self._keys[i]
+            if key is None:
+                content = 'EMPTY'
+            elif key is _TOMBSTONE:
+                content = 'TOMBSTONE'
+            else:
+                content = '(' + str(key) + ': ' + str(self._values[i]) + ')'
+            out += str(i) + ': ' + content + '\n'
+        return out
+
+    def _find_slot(self, key: str, key_hash: int) -> int:
+        """
+        Returns the index of the slot holding the given key, or -1 if the
+        key is not in the hash map.
+        """
+        keys, hashes, capacity = self._keys, self._hashes, self.capacity
+        index = key_hash % capacity
+
+        # walk the probe sequence until an empty (never used) slot is reached
+        while True:
+            cur = keys[index]
+            if cur is None:
+                return -1
+            # compare stored hashes first so most mismatches skip the string compare
+            if cur is not _TOMBSTONE and hashes[index] == key_hash and cur == key:
+                return index
+
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def clear(self) -> None:
+        """
+        Empties every slot in the hash map and sets hash map size to 0.
+        Capacity is unchanged. Returns nothing.
+        """
+        self._keys = [None] * self.capacity
+        self._values = [None] * self.capacity
+        self._hashes = [0] * self.capacity
+        self.size = 0
+        self._tombstones = 0
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        if self.size == 0:
+            return None
+
+        index = self._find_slot(key, self.hash_function(key))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, only its value is replaced. Grows the table first if the
+        new entry would push the used slots past MAX_LOAD_FACTOR.
+        """
+        # mirror HashMap: a zero capacity map silently ignores puts
+        if self.capacity == 0:
+            return None
+
+        # make room before probing so there is always an empty slot to stop on
+        if (self.size + self._tombstones + 1) / self.capacity > self.MAX_LOAD_FACTOR:
+            self.resize_table(max(self.capacity * 2, 2 * (self.size + 1)))
+
+        key_hash = self.hash_function(key)
+        keys, hashes, capacity = self._keys, self._hashes, self.capacity
+        index = key_hash % capacity
+        first_tombstone = -1
+
+        while True:
+            cur = keys[index]
+
+            # key not present - insert at the first reusable slot on the probe path
+            if cur is None:
+                if first_tombstone != -1:
+                    index = first_tombstone
+                    self._tombstones -= 1
+                keys[index] = key
+                hashes[index] = key_hash
+                self._values[index] = value
+                self.size += 1
+                return None
+
+            if cur is _TOMBSTONE:
+                if first_tombstone == -1:
+                    first_tombstone = index
+
+            # key already present - replace only the value
+            elif hashes[index] == key_hash and cur == key:
+                self._values[index] = value
+                return None
+
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map, leaving a
+        tombstone in its slot. Does nothing if the key is not present.
+        """
+        if self.size == 0:
+            return None
+
+        index = self._find_slot(key, self.hash_function(key))
+        if index == -1:
+            return None
+
+        self._keys[index] = _TOMBSTONE
+        self._values[index] = None
+        self.size -= 1
+        self._tombstones += 1
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        if self.size == 0:
+            return False
+        return self._find_slot(key, self.hash_function(key)) != -1
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of slots that do not hold a live entry
+        (empty slots and tombstones).
+        """
+        return self.capacity - self.size
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/number of slots).
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Moves every entry into a new table with the given number of slots,
+        dropping all tombstones. Stored hash values are reused, so
+        hash_function is not called. Does nothing if new_capacity is smaller
+        than the number of entries (or < 1).
+        """
+        if new_capacity < 1 or new_capacity < self.size:
+            return None
+
+        # never leave the new table without an empty slot to terminate probes
+        if new_capacity == self.size:
+            new_capacity += 1
+
+        old_keys, old_values, old_hashes = self._keys, self._values, self._hashes
+        keys = [None] * new_capacity
+        values = [None] * new_capacity
+        hashes = [0] * new_capacity
+
+        for i in range(self.capacity):
+            key = old_keys[i]
+            if key is None or key is _TOMBSTONE:
+                continue
+
+            # live entries are unique, so only an empty slot needs to be found
+            key_hash = old_hashes[i]
+            index = key_hash % new_capacity
+            while keys[index] is not None:
+                index += 1
+                if index == new_capacity:
+                    index = 0
+
+            keys[index] = key
+            values[index] = old_values[i]
+            hashes[index] = key_hash
+
+        self._keys, self._values, self._hashes = keys, values, hashes
+        self.capacity = new_capacity
+        self._tombstones = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for key in self._keys:
+            if key is not None and key is not _TOMBSTONE:
+                temp_da.append(key)
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = OpenAddressHashMap(10, hash_function_1)
+    for i in range(25):
+        m.put('key' + str(i), i * 10)
+    print(m.size, m.capacity, round(m.table_load(), 2))
+    m.put('key3', 'replaced')
+    print(m.get('key3'), m.get('key24'), m.get('missing'))
+    for i in range(0, 25, 2):
+        m.remove('key' + str(i))
+    result = True
+    for i in range(25):
+        result &= m.contains_key('key' + str(i)) == (i % 2 == 1)
+    print(result, m.size)
+
+    print("\nresize_table / get_keys")
+    print("-----------------------")
+    m = OpenAddressHashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    m.resize_table(31)
+    print(m.size, m.capacity, m.empty_buckets())
+    print(m.get_keys())
+    m.clear()
+    print(m.size, m.capacity, m.get('100'))
@@ -0,0 +1,284 @@
+# Course: CS261 - Data Structures
+# Description: Implementation of a Hash Map Abstract Data Type with collision
+#              resolution using Robin Hood hashing (linear probing where an
+#              entry far from its home slot takes the place of one closer to
+#              its own) and backward shift deletion. Keeps probe lengths short
+#              and even, and reports their distribution.
+
+
+# Import pre-written DynamicArray class and the sample hash functions
+from a7_include import *
+from hash_map import hash_function_2
+
+
+class RobinHoodHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap that stores
+    keys, values, hash values and probe distances in flat parallel arrays.
+    Grows itself whenever the load factor would exceed MAX_LOAD_FACTOR.
+
+    The probe distance of an entry is how many slots past its home slot
+    (hash % capacity) it is stored; a distance of -1 marks an empty slot.
+    """
+
+    MAX_LOAD_FACTOR = 0.85
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Init new Robin Hood HashMap with the given number of slots
+        """
+        self.capacity = capacity
+        self.hash_function = function
+        self.size = 0
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._dists = [-1] * capacity
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form
+        """
+        out = ''
+        for i in range(self.capacity):
+            if self._dists[i] == -1:
+                content = 'EMPTY'
+            else:
+                content = '(' + str(self._keys[i]) + ': ' + str(self._values[i]) + ')'
+            out += str(i) + ': ' + content + '\n'
+        return out
+
+    def _find_slot(self, key: str, key_hash: int) -> int:
+        """
+        Returns the index of the slot holding the given key, or -1 if the
+        key is not in the hash map.
+        """
+        keys, hashes, dists, capacity = self._keys, self._hashes, self._dists, self.capacity
+        index = key_hash % capacity
+        dist = 0
+
+        # an entry closer to its home slot than we are to ours (or an empty
+        # slot) means the key would have been stored before this point
+        while dists[index] >= dist:
+            if hashes[index] == key_hash and keys[index] == key:
+                return index
+
+            dist += 1
+            index += 1
+            if index == capacity:
+                index = 0
+
+        return -1
+
+    def _place(self, key: str, value: object, key_hash: int) -> None:
+        """
+        Inserts a key that is known not to be in the hash map, displacing
+        entries that are closer to their home slot along the way.
+        """
+        keys, values, hashes, dists = self._keys, self._values, self._hashes, self._dists
+        capacity = self.capacity
+        index = key_hash % capacity
+        dist = 0
+
+        while True:
+            # empty slot - the carried entry ends up here
+            if dists[index] == -1:
+                keys[index], values[index], hashes[index], dists[index] = key, value, key_hash, dist
+                return None
+
+            # the resident is better off than the carried entry - swap them and
+            # carry on placing the resident
+            if dists[index] < dist:
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                hashes[index], key_hash = key_hash, hashes[index]
+                dists[index], dist = dist, dists[index]
+
+            dist += 1
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def clear(self) -> None:
+        """
+        Empties every slot in the hash map and sets hash map size to 0.
+        Capacity is unchanged. Returns nothing.
+        """
+        self._keys = [None] * self.capacity
+        self._values = [None] * self.capacity
+        self._hashes = [0] * self.capacity
+        self._dists = [-1] * self.capacity
+        self.size = 0
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        if self.size == 0:
+            return None
+
+        index = self._find_slot(key, self.hash_function(key))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, only its value is replaced.
+        """
+        # mirror HashMap: a zero capacity map silently ignores puts
+        if self.capacity == 0:
+            return None
+
+        key_hash = self.hash_function(key)
+
+        # key already present - replace only the value
+        index = self._find_slot(key, key_hash)
+        if index != -1:
+            self._values[index] = value
+            return None
+
+        if (self.size + 1) / self.capacity > self.MAX_LOAD_FACTOR:
+            self.resize_table(max(self.capacity * 2, self.size + 2))
+
+        self._place(key, value, key_hash)
+        self.size += 1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map by shifting
+        the following displaced entries back one slot each, so no tombstone
+        is left behind. Does nothing if the key is not present.
+        """
+        if self.size == 0:
+            return None
+
+        index = self._find_slot(key, self.hash_function(key))
+        if index == -1:
+            return None
+
+        keys, values, hashes, dists = self._keys, self._values, self._hashes, self._dists
+        capacity = self.capacity
+
+        # pull back every following entry that is not in its home slot
+        next_index = index + 1 if index + 1 < capacity else 0
+        while dists[next_index] > 0:
+            keys[index], values[index] = keys[next_index], values[next_index]
+            hashes[index], dists[index] = hashes[next_index], dists[next_index] - 1
+            index = next_index
+            next_index = index + 1 if index + 1 < capacity else 0
+
+        keys[index], values[index], hashes[index], dists[index] = None, None, 0, -1
+        self.size -= 1
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        if self.size == 0:
+            return False
+        return self._find_slot(key, self.hash_function(key)) != -1
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of slots that do not hold an entry.
+        """
+        return self.capacity - self.size
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/number of slots).
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Moves every entry into a new table with the given number of slots.
+        Stored hash values are reused, so hash_function is not called.
+        Does nothing if new_capacity is not larger than the number of
+        entries.
+        """
+        if new_capacity <= self.size:
+            return None
+
+        old_keys, old_values, old_hashes, old_dists = self._keys, self._values, self._hashes, self._dists
+        old_capacity = self.capacity
+
+        self.capacity = new_capacity
+        self._keys = [None] * new_capacity
+        self._values = [None] * new_capacity
+        self._hashes = [0] * new_capacity
+        self._dists = [-1] * new_capacity
+
+        for i in range(old_capacity):
+            if old_dists[i] != -1:
+                self._place(old_keys[i], old_values[i], old_hashes[i])
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for i in range(self.capacity):
+            if self._dists[i] != -1:
+                temp_da.append(self._keys[i])
+        return temp_da
+
+    def probe_length_histogram(self) -> dict:
+        """
+        Returns a dictionary mapping each probe length to the number of
+        entries that need that many slot inspections to be found
+        (probe length = probe distance + 1).
+        """
+        histogram = {}
+        for dist in self._dists:
+            if dist != -1:
+                histogram[dist + 1] = histogram.get(dist + 1, 0) + 1
+        return histogram
+
+    def max_probe_length(self) -> int:
+        """
+        Returns the most slots a successful lookup inspects (0 if empty).
+        """
+        return max(self._dists, default=-1) + 1
+
+    def mean_probe_length(self) -> float:
+        """
+        Returns the average number of slots a successful lookup inspects
+        (0 if empty).
+        """
+        if self.size == 0:
+            return 0.0
+        return sum(dist + 1 for dist in self._dists if dist != -1) / self.size
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = RobinHoodHashMap(10, hash_function_2)
+    for i in range(25):
+        m.put('key' + str(i), i * 10)
+    print(m.size, m.capacity, round(m.table_load(), 2))
+    m.put('key3', 'replaced')
+    print(m.get('key3'), m.get('key24'), m.get('missing'))
+    for i in range(0, 25, 2):
+        m.remove('key' + str(i))
+    result = True
+    for i in range(25):
+        result &= m.contains_key('key' + str(i)) == (i % 2 == 1)
+    print(result, m.size)
+
+    print("\nprobe lengths")
+    print("-------------")
+    m = RobinHoodHashMap(16, hash)
+    for i in range(10000):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity, round(m.table_load(), 2))
+    print(m.max_probe_length(), round(m.mean_probe_length(), 2))
+    print(sorted(m.probe_length_histogram().items()))
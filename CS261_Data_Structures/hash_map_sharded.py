@@ -0,0 +1,296 @@
+# Course: CS261 - Data Structures
+# Description: Hash Map facade that spreads its keys over several worker
+#              processes, each owning its own HashMap, so lookups and updates
+#              on different shards run on different cores instead of sharing
+#              one interpreter lock. Requests travel over pipes and can be
+#              batched.
+
+
+import multiprocessing
+
+# Import pre-written DynamicArray class and the chained HashMap
+from a7_include import *
+from hash_map import HashMap, hash_function_fnv1a
+
+
+def _shard_worker(conn, capacity: int, function) -> None:
+    """
+    Runs in a worker process. Owns one self-resizing HashMap and answers
+    (command, args) requests from the pipe until it receives 'close'.
+    Every reply is a tagged (ok, payload) tuple: (True, result), or
+    (False, exception) if the request raised one.
+    """
+    m = HashMap(capacity, function, max_load_factor=1.0)
+
+    while True:
+        command, args = conn.recv()
+        if command == 'close':
+            conn.close()
+            return None
+
+        try:
+            if command == 'stats':
+                result = {'size': m.size, 'capacity': m.capacity,
+                          'table_load': m.table_load(), 'empty_buckets': m.empty_buckets()}
+            elif command == 'get_keys':
+                result = list(m.keys())
+            elif command == 'get_many':
+                result = m.get_many(*args).data
+            else:
+                result = getattr(m, command)(*args)
+        except Exception as error:
+            conn.send((False, error))
+        else:
+            conn.send((True, result))
+
+
+class ShardedHashMap:
+    """
+    Hash map with the same public interface as hash_map.HashMap whose keys
+    are split over a number of worker processes (shards).
+
+    A key's shard is picked in this process with the built-in hash(), so
+    the hash function only has to be picklable, not stable across processes.
+    Batch methods send one request per shard to every shard before waiting
+    for any reply, so the shards work on a batch at the same time.
+
+    The worker processes run until close() is called (or the with block
+    the map was opened in ends).
+    """
+
+    def __init__(self, shards: int, capacity: int, function=hash_function_fnv1a) -> None:
+        """
+        Starts the given number of shard processes, each with a HashMap of
+        capacity / shards buckets that resizes itself as it fills up
+        """
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+        self.shards = shards
+        self.hash_function = function
+        self._conns = []
+        self._processes = []
+
+        shard_capacity = max(-(-capacity // shards), 1)
+        for _ in range(shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker,
+                                              args=(child_conn, shard_capacity, function),
+                                              daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self):
+        """ Supports 'with ShardedHashMap(...) as m:' """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Stops the shard processes at the end of the with block """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops every shard process. The map cannot be used afterwards.
+        """
+        for conn, process in zip(self._conns, self._processes):
+            conn.send(('close', ()))
+            conn.close()
+            process.join()
+        self._conns, self._processes = [], []
+
+    def _shard(self, key: str) -> int:
+        """ Returns the shard number the given key belongs to """
+        return hash(key) % self.shards
+
+    def _call(self, shard: int, command: str, *args) -> object:
+        """
+        Sends one request to a shard and returns its reply, raising the
+        shard's exception if the request failed.
+        """
+        self._conns[shard].send((command, args))
+        return self._receive(shard)
+
+    def _receive(self, shard: int) -> object:
+        """ Waits for the next reply from a shard, raising its exception if the request failed """
+        return self._receive_all([shard])[0]
+
+    def _receive_all(self, shards) -> list:
+        """
+        Waits for the next reply from each of the given shards and returns
+        the results in the same order. Every reply is read before the first
+        failed request's exception is raised, so no reply is left in a pipe
+        to be mistaken for the answer to a later request.
+        """
+        replies = [self._conns[shard].recv() for shard in shards]
+        for ok, payload in replies:
+            if not ok:
+                raise payload
+        return [payload for _, payload in replies]
+
+    def _broadcast(self, command: str, *args) -> list:
+        """
+        Sends the same request to every shard, then collects the replies
+        in shard order.
+        """
+        for conn in self._conns:
+            conn.send((command, args))
+        return self._receive_all(range(self.shards))
+
+    @property
+    def size(self) -> int:
+        """ Number of key:value pairs across all shards """
+        return sum(stats['size'] for stats in self.shard_loads())
+
+    @property
+    def capacity(self) -> int:
+        """ Total number of buckets across all shards """
+        return sum(stats['capacity'] for stats in self.shard_loads())
+
+    def shard_loads(self) -> list:
+        """
+        Returns a list with one dictionary per shard holding its size,
+        capacity, table_load and empty_buckets.
+        """
+        return self._broadcast('stats')
+
+    def clear(self) -> None:
+        """
+        Removes every key:value pair from every shard. Returns nothing.
+        """
+        self._broadcast('clear')
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        return self._call(self._shard(key), 'get', key)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the hash map. If the key is already
+        present, only its value is replaced.
+        """
+        self._call(self._shard(key), 'put', key, value)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        Does nothing if the key is not present.
+        """
+        self._call(self._shard(key), 'remove', key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        return self._call(self._shard(key), 'contains_key', key)
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds every key:value pair of the given iterable to the hash map,
+        with one request per shard.
+        """
+        batches = [[] for _ in range(self.shards)]
+        for key, value in pairs:
+            batches[self._shard(key)].append((key, value))
+
+        for shard, batch in enumerate(batches):
+            self._conns[shard].send(('put_many', (batch,)))
+        self._receive_all(range(self.shards))
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a new DynamicArray holding the value of each of the given
+        keys, in the same order (None for keys not in the hash map), with
+        one request per shard.
+        """
+        keys = list(keys)
+        positions = [[] for _ in range(self.shards)]
+        batches = [[] for _ in range(self.shards)]
+        for pos, key in enumerate(keys):
+            shard = self._shard(key)
+            positions[shard].append(pos)
+            batches[shard].append(key)
+
+        for shard, batch in enumerate(batches):
+            self._conns[shard].send(('get_many', (batch,)))
+
+        # put every shard's answers back in the order the keys were given
+        results = [None] * len(keys)
+        for shard, values in enumerate(self._receive_all(range(self.shards))):
+            for pos, value in zip(positions[shard], values):
+                results[pos] = value
+        return DynamicArray(results)
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes each of the given keys from the hash map, with one request
+        per shard.
+        """
+        batches = [[] for _ in range(self.shards)]
+        for key in keys:
+            batches[self._shard(key)].append(key)
+
+        for shard, batch in enumerate(batches):
+            self._conns[shard].send(('remove_many', (batch,)))
+        self._receive_all(range(self.shards))
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of buckets, across all shards, that hold no nodes.
+        """
+        return sum(stats['empty_buckets'] for stats in self.shard_loads())
+
+    def table_load(self) -> float:
+        """
+        Calculates and returns the load factor of the hash map
+        (i.e. total number of elements/total number of buckets).
+        """
+        loads = self.shard_loads()
+        return sum(stats['size'] for stats in loads) / sum(stats['capacity'] for stats in loads)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes every shard so that together they have (about) the given
+        number of buckets. Does nothing if new_capacity < 1.
+        """
+        if new_capacity < 1:
+            return None
+        self._broadcast('resize_table', max(-(-new_capacity // self.shards), 1))
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for keys in self._broadcast('get_keys'):
+            for key in keys:
+                temp_da.append(key)
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    with ShardedHashMap(4, 16) as m:
+        for i in range(25):
+            m.put('key' + str(i), i * 10)
+        print(m.size, m.get('key3'), m.contains_key('key24'), m.contains_key('x'))
+        m.remove('key3')
+        print(m.size, m.get('key3'), m.get_keys().length())
+
+        print("\nbatches and shard loads")
+        print("-----------------------")
+        m.clear()
+        m.put_many(('key' + str(i), i) for i in range(10000))
+        values = m.get_many('key' + str(i) for i in range(0, 10000, 1000))
+        print(m.size, values)
+        for stats in m.shard_loads():
+            print(stats['size'], stats['capacity'], round(stats['table_load'], 2))
+        m.remove_many('key' + str(i) for i in range(5000))
+        print(m.size, m.get('key4999'), m.get('key5000'))
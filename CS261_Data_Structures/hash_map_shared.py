@@ -0,0 +1,275 @@
+# Course: CS261 - Data Structures
+# Description: Read-only Hash Map in a shared memory block. freeze() lays out
+#              the entries of an existing HashMap as an open-addressed index
+#              plus a packed arena of keys and values, and any number of
+#              processes can attach to the block by name and look keys up in
+#              place, without each loading its own copy of the map.
+#
+# Block layout (all integers little-endian):
+#   header  magic, size, slot count, arena offset, arena length, creator's
+#           resource tracker pid
+#   index   slot count x (FNV-1a key hash, arena offset, key length, value length),
+#           arena offset 2^64 - 1 marks an empty slot; linear probing
+#   arena   per entry: key (UTF-8) immediately followed by value (pickle)
+
+
+import pickle
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+# Import pre-written DynamicArray class and the chained HashMap
+from a7_include import *
+from hash_map import HashMap, hash_function_fnv1a, hash_function_name
+
+
+_MAGIC = b'HMAPSHM1'
+_HEADER = struct.Struct('<8sQQQQQ')
+_SLOT = struct.Struct('<QQII')
+
+# arena offset marking an empty index slot
+_EMPTY = 0xFFFFFFFFFFFFFFFF
+
+
+def _tracker_pid() -> int:
+    """
+    Returns the pid of the multiprocessing resource tracker this process
+    started or inherited by fork, or 0 if it has none or was given its
+    parent's tracker when spawned by multiprocessing (then only the pipe
+    to it is known).
+    """
+    tracker = getattr(resource_tracker, '_resource_tracker', None)
+    return getattr(tracker, '_pid', None) or 0
+
+
+def freeze(hash_map: HashMap, name: str = None) -> 'SharedHashMap':
+    """
+    Copies every entry of the given HashMap into a new shared memory block
+    (with the given name, or a generated one) and returns the SharedHashMap
+    owning it. Values must be picklable.
+
+    Keys are indexed with hash_function_fnv1a, which gives the same value
+    in every process; the stored hashes of a map that already uses it are
+    reused. The index has at least twice as many slots as entries.
+    """
+    reuse_hashes = hash_function_name(hash_map.hash_function) == 'fnv1a'
+    entries = []
+    arena_length = 0
+    for node in hash_map._nodes():
+        key_bytes = node.key.encode()
+        value_bytes = pickle.dumps(node.value, pickle.HIGHEST_PROTOCOL)
+        key_hash = node.hash if reuse_hashes else hash_function_fnv1a(node.key)
+        entries.append((key_hash, key_bytes, value_bytes))
+        arena_length += len(key_bytes) + len(value_bytes)
+
+    slot_count = 8
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+    arena_offset = _HEADER.size + slot_count * _SLOT.size
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(arena_offset + arena_length, 1))
+    buf = shm.buf
+    _HEADER.pack_into(buf, 0, _MAGIC, len(entries), slot_count, arena_offset, arena_length, _tracker_pid())
+    for slot in range(slot_count):
+        _SLOT.pack_into(buf, _HEADER.size + slot * _SLOT.size, 0, _EMPTY, 0, 0)
+
+    # write each entry to the arena and point the first free slot on its probe path at it
+    mask = slot_count - 1
+    offset = arena_offset
+    for key_hash, key_bytes, value_bytes in entries:
+        slot = key_hash & mask
+        while _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)[1] != _EMPTY:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(buf, _HEADER.size + slot * _SLOT.size,
+                        key_hash, offset, len(key_bytes), len(value_bytes))
+        buf[offset:offset + len(key_bytes)] = key_bytes
+        offset += len(key_bytes)
+        buf[offset:offset + len(value_bytes)] = value_bytes
+        offset += len(value_bytes)
+
+    return SharedHashMap(shm, owner=True)
+
+
+class SharedHashMap:
+    """
+    Read-only view of a hash map frozen into shared memory by freeze().
+    Supports get, contains_key, get_keys, keys, items and len().
+
+    Lookups compare the key against the arena in place; only the value of
+    a found key is copied out (unpickled). The owner (the process that
+    called freeze) should unlink() the block once no reader needs it;
+    every process should close() its view.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False) -> None:
+        """
+        Init new view of the given shared memory block. Use freeze() or
+        SharedHashMap.attach() rather than calling this directly.
+        """
+        magic, size, slot_count, arena_offset, arena_length, tracker_pid = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(shm.name + ' is not a frozen HashMap')
+        self._shm = shm
+        self._buf = shm.buf
+        self.owner = owner
+        self.size = size
+        self.capacity = slot_count
+        self._mask = slot_count - 1
+        self._creator_tracker_pid = tracker_pid
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedHashMap':
+        """
+        Returns a view of the frozen hash map in the shared memory block
+        with the given name (SharedHashMap.name of the owner).
+        """
+        try:
+            # Python 3.13+: readers do not register the block with a resource tracker
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+            shared_map = cls(shm)
+            # older versions register every attached block, and a tracker unlinks
+            # what it knows about when its process tree exits - a reader that
+            # started a tracker of its own (it was not forked or spawned from the
+            # owner) would delete the block for everyone, so it unregisters it
+            reader_tracker_pid = _tracker_pid()
+            if reader_tracker_pid != 0 and reader_tracker_pid != shared_map._creator_tracker_pid:
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            return shared_map
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        """ Name of the shared memory block, for attach() """
+        return self._shm.name
+
+    def __enter__(self):
+        """ Supports 'with SharedHashMap.attach(name) as m:' """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Closes the view at the end of the with block """
+        self.close()
+
+    def __len__(self) -> int:
+        """ Return the number of key:value pairs in the hash map """
+        return self.size
+
+    def __contains__(self, key: str) -> bool:
+        """ Supports the 'key in shared_map' syntax """
+        return self.contains_key(key)
+
+    def close(self) -> None:
+        """
+        Closes this process's view of the block. The block itself stays
+        until it is unlinked.
+        """
+        if self._buf is not None:
+            self._buf = None
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Closes the view and frees the shared memory block. Processes that
+        are still attached keep their mapping until they close it.
+        """
+        self.close()
+        self._shm.unlink()
+
+    def _find_slot(self, key: str) -> tuple:
+        """
+        Returns (arena offset, key length, value length) of the entry holding
+        the given key, or None if the key is not in the hash map.
+        """
+        key_bytes = key.encode()
+        key_hash = hash_function_fnv1a(key)
+        buf, mask = self._buf, self._mask
+
+        slot = key_hash & mask
+        while True:
+            slot_hash, offset, key_length, value_length = _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)
+            if offset == _EMPTY:
+                return None
+            if (slot_hash == key_hash and key_length == len(key_bytes)
+                    and buf[offset:offset + key_length] == key_bytes):
+                return offset, key_length, value_length
+            slot = (slot + 1) & mask
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map, returns None.
+        """
+        found = self._find_slot(key)
+        if found is None:
+            return None
+        offset, key_length, value_length = found
+        return pickle.loads(self._buf[offset + key_length:offset + key_length + value_length])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map, otherwise False.
+        """
+        return self._find_slot(key) is not None
+
+    def _slots(self):
+        """ Generator yielding (arena offset, key length, value length) of every entry """
+        buf = self._buf
+        for slot in range(self.capacity):
+            _, offset, key_length, value_length = _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)
+            if offset != _EMPTY:
+                yield offset, key_length, value_length
+
+    def keys(self):
+        """
+        Returns a generator over the keys of the hash map.
+        """
+        return (bytes(self._buf[offset:offset + key_length]).decode()
+                for offset, key_length, _ in self._slots())
+
+    def items(self):
+        """
+        Returns a generator over the (key, value) pairs of the hash map.
+        """
+        return ((bytes(self._buf[offset:offset + key_length]).decode(),
+                 pickle.loads(self._buf[offset + key_length:offset + key_length + value_length]))
+                for offset, key_length, value_length in self._slots())
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map and returns them in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for key in self.keys():
+            temp_da.append(key)
+        return temp_da
+
+
+def _reader(name: str, count: int) -> tuple:
+    """ Looks up count keys in an attached frozen map (run in a worker process) """
+    with SharedHashMap.attach(name) as m:
+        found = sum(m.get('key' + str(i)) == [i, str(i)] for i in range(count))
+        return found, m.contains_key('missing'), m.size
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+    import multiprocessing
+
+    print("\nfreeze / get")
+    print("------------")
+    source = HashMap(16, 'fnv1a', max_load_factor=1.0)
+    for i in range(10000):
+        source.put('key' + str(i), [i, str(i)])
+    frozen = freeze(source)
+    print(frozen.size, frozen.capacity, frozen.get('key42'), frozen.get('key10000'), 'key9999' in frozen)
+    print(sorted(frozen.keys()) == sorted(source.keys()), dict(frozen.items())['key7'])
+
+    print("\nreader processes")
+    print("----------------")
+    with multiprocessing.Pool(4) as pool:
+        print(pool.starmap(_reader, [(frozen.name, 10000)] * 4))
+    print(frozen.get('key1'))
+    frozen.unlink()
@@ -0,0 +1,240 @@
+# Course: CS261 - Data Structures
+# Description: Opt-in instrumentation for HashMap. While attached, a recorder
+#              replaces a few methods of one HashMap instance with versions that
+#              record chain walk lengths, hash function times and resize events.
+#              Maps without a recorder run the plain class methods untouched.
+
+
+import functools
+import time
+
+
+class Histogram:
+    """
+    Counts of integer values (values are rounded down to a multiple of
+    resolution first), with percentiles computed from the counts.
+    """
+
+    def __init__(self, resolution: int = 1) -> None:
+        """ Init new empty histogram """
+        self.resolution = resolution
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+
+    def add(self, value: int) -> None:
+        """ Adds one value """
+        value = value // self.resolution * self.resolution
+        self.counts[value] = self.counts.get(value, 0) + 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> int:
+        """
+        Returns the smallest recorded value that at least p percent of the
+        values are less than or equal to, or None if the histogram is empty.
+        """
+        if self.count == 0:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= target:
+                return value
+        return max(self.counts)
+
+    def summary(self) -> dict:
+        """
+        Returns a dictionary with the number of values, their mean, the
+        50th/90th/99th percentiles, the maximum and the histogram itself
+        (value: count, in increasing order of value).
+        """
+        if self.count == 0:
+            return {'count': 0, 'mean': None, 'p50': None, 'p90': None, 'p99': None, 'max': None,
+                    'histogram': {}}
+        return {'count': self.count, 'mean': self.total / self.count,
+                'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99),
+                'max': max(self.counts), 'histogram': dict(sorted(self.counts.items()))}
+
+
+class HashMapRecorder:
+    """
+    Records what one HashMap does while attached:
+
+    - chain walk length of every get, put, contains_key and remove (the
+      number of nodes compared before the key was found, or the whole
+      chain if it was not), per operation; a remove() that returns before
+      walking a chain (e.g. ruled out by the Bloom filter) records nothing
+    - time of every hash function call, in nanoseconds (100 ns resolution)
+    - every resize_table call: old and new capacity, size and duration
+
+    attach() stores wrappers as attributes of the map instance, which take
+    precedence over the class methods; detach() deletes them again. Batch
+    methods (put_many, get_many, remove_many) are not recorded, apart from
+    their hash function calls.
+    """
+
+    OPERATIONS = ('get', 'put', 'contains_key', 'remove')
+
+    def __init__(self, hash_map) -> None:
+        """ Init new recorder for the given map (not attached yet) """
+        self.hash_map = hash_map
+        self.attached = False
+        self.reset()
+
+    def reset(self) -> None:
+        """ Drops everything recorded so far """
+        self.operation_counts = {operation: 0 for operation in self.OPERATIONS}
+        self.chain_walks = {operation: Histogram() for operation in self.OPERATIONS}
+        self.hash_times = Histogram(100)
+        self.resizes = []
+        # operation the next chain walk belongs to, and the nodes a remove()
+        # being recorded has walked so far (None until it walks a bucket)
+        self._operation = None
+        self._remove_walk = None
+
+    def attach(self) -> None:
+        """ Starts recording by installing the wrappers on the map """
+        if self.attached:
+            return None
+        m = self.hash_map
+        self._hash_function = m.hash_function
+        m.hash_function = self._timed_hash(m.hash_function)
+        m._find_node = self._find_node
+        m._unlink = self._unlink
+        m.resize_table = self._resize_table
+        for operation in self.OPERATIONS:
+            setattr(m, operation, self._operation_wrapper(operation))
+        self.attached = True
+
+    def detach(self) -> None:
+        """ Stops recording and restores the plain class methods """
+        if not self.attached:
+            return None
+        m = self.hash_map
+        m.hash_function = self._hash_function
+        for name in ('_find_node', '_unlink', 'resize_table') + self.OPERATIONS:
+            delattr(m, name)
+        self.attached = False
+
+    def _timed_hash(self, function):
+        """ Returns the hash function wrapped to record the time of each call """
+        @functools.wraps(function)
+        def timed_hash(key: str) -> int:
+            start = time.perf_counter_ns()
+            key_hash = function(key)
+            self.hash_times.add(time.perf_counter_ns() - start)
+            return key_hash
+        return timed_hash
+
+    def _operation_wrapper(self, operation: str):
+        """
+        Returns the class method of the given operation bound to the map,
+        wrapped to count the call and tag the chain walk it causes.
+        """
+        method = getattr(type(self.hash_map), operation).__get__(self.hash_map)
+
+        @functools.wraps(method)
+        def wrapper(key, *args, **kwargs):
+            self.operation_counts[operation] += 1
+            self._operation = operation
+            self._remove_walk = None
+            try:
+                return method(key, *args, **kwargs)
+            finally:
+                # remove() walks one or two buckets through _unlink; one that
+                # returned early (empty map, key ruled out by the Bloom
+                # filter) walked nothing and records nothing
+                if self._remove_walk is not None:
+                    self.chain_walks[operation].add(self._remove_walk)
+                self._operation = None
+        return wrapper
+
+    def _walk(self, bucket, key: str, key_hash: int) -> tuple:
+        """
+        Walks a chain like HashedLinkedList.contains and returns the node
+        holding the key (or None) and the number of nodes compared.
+        """
+        walked = 0
+        node = bucket.head if bucket is not None else None
+        while node is not None:
+            walked += 1
+            if node.hash == key_hash and node.key == key:
+                return node, walked
+            node = node.next
+        return None, walked
+
+    def _find_node(self, key: str, key_hash: int):
+        """ HashMap._find_node that records the length of the walk """
+        m = self.hash_map
+        node, walked = None, 0
+
+        # same order as HashMap._find_node: a not yet moved old bucket first
+        if m._old_buckets is not None:
+            old_ind = key_hash % m._old_buckets.length()
+            if old_ind >= m._rehash_index:
+                node, walked = self._walk(m._old_buckets.get_at_index(old_ind), key, key_hash)
+        if node is None:
+            node, more = self._walk(m.buckets.get_at_index(key_hash % m.capacity), key, key_hash)
+            walked += more
+
+        if self._operation is not None:
+            self.chain_walks[self._operation].add(walked)
+        return node
+
+    def _unlink(self, bucket, key: str, key_hash: int) -> bool:
+        """
+        HashMap._unlink that unlinks the node like HashedLinkedList.remove
+        and adds the number of nodes compared to the remove being recorded
+        """
+        walked, removed = 0, False
+        prev, node = None, bucket.head if bucket is not None else None
+        while node is not None:
+            walked += 1
+            if node.hash == key_hash and node.key == key:
+                if prev is None:
+                    bucket.head = node.next
+                else:
+                    prev.next = node.next
+                bucket.size -= 1
+                removed = True
+                break
+            prev, node = node, node.next
+
+        if self._operation == 'remove':
+            self._remove_walk = (self._remove_walk or 0) + walked
+        return removed
+
+    def _resize_table(self, new_capacity: int) -> None:
+        """ HashMap.resize_table that records the resize """
+        m = self.hash_map
+        old_capacity, size = m.capacity, m.size
+        start = time.perf_counter()
+        type(m).resize_table(m, new_capacity)
+        if m.capacity != old_capacity:
+            self.resizes.append({'old_capacity': old_capacity, 'new_capacity': m.capacity, 'size': size,
+                                 'seconds': time.perf_counter() - start,
+                                 'incremental': m._old_buckets is not None})
+
+    def stats(self) -> dict:
+        """
+        Returns a dictionary of everything recorded so far: operation counts,
+        a Histogram summary of the chain walks per operation and of all of
+        them together, a summary of the hash times (ns) and the resizes.
+        """
+        combined = Histogram()
+        for histogram in self.chain_walks.values():
+            for value, count in histogram.counts.items():
+                combined.counts[value] = combined.counts.get(value, 0) + count
+                combined.count += count
+                combined.total += value * count
+
+        return {'operations': dict(self.operation_counts),
+                'chain_walk': dict({operation: histogram.summary()
+                                    for operation, histogram in self.chain_walks.items()},
+                                   all=combined.summary()),
+                'hash_time_ns': self.hash_times.summary(),
+                'resizes': list(self.resizes),
+                'size': self.hash_map.size,
+                'capacity': self.hash_map.capacity}
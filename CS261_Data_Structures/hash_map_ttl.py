@@ -0,0 +1,240 @@
+# Course: CS261 - Data Structures
+# Description: Hash Map whose entries can expire. Expired entries are dropped
+#              when they are looked up, and an incremental sweeper reclaims the
+#              ones nobody asks for again, a few buckets at a time.
+
+
+import time
+
+# Import pre-written DynamicArray class and the chained HashMap
+from a7_include import *
+from hash_map import HashMap
+
+# default of the ttl arguments - stands for "not given", so that an
+# explicit ttl=None can still mean "never expires"
+_DEFAULT_TTL = object()
+
+
+class TTLEntry:
+    """
+    Value stored in the nodes of a TTLHashMap: the caller's value and the
+    clock time it expires at (None if it never does).
+    """
+
+    __slots__ = ('value', 'expires')
+
+    def __init__(self, value: object, expires: float) -> None:
+        """ Init new entry """
+        self.value = value
+        self.expires = expires
+
+    def __str__(self) -> str:
+        """ Return the value in human-readable form (used by HashMap.__str__) """
+        return str(self.value)
+
+    def expired(self, now: float) -> bool:
+        """ Return True if the entry has expired at the given clock time """
+        return self.expires is not None and self.expires <= now
+
+
+class TTLHashMap(HashMap):
+    """
+    HashMap in which every entry may have a time-to-live (in seconds of the
+    given clock, time.monotonic by default).
+
+    get/contains_key treat an expired entry as missing and remove it. Every
+    put also sweeps sweep_step buckets, continuing where the last sweep
+    stopped, so entries that are never looked up again are reclaimed within
+    about capacity / sweep_step puts without a full-table scan. sweep() can
+    be called directly (e.g. from an idle loop) to reclaim faster.
+
+    size counts expired entries that have not been reclaimed yet; keys(),
+    values(), items() and get_keys() skip them.
+    """
+
+    def __init__(self, capacity: int, function, default_ttl: float = None, sweep_step: int = 2,
+                 clock=time.monotonic, **options) -> None:
+        """
+        Init new TTLHashMap. default_ttl is used by put() calls that do not
+        give a ttl (None means entries do not expire, and an explicit
+        ttl=None overrides it). options are passed on to HashMap() (e.g.
+        max_load_factor).
+        """
+        super().__init__(capacity, function, **options)
+        self.default_ttl = default_ttl
+        self.sweep_step = sweep_step
+        self.clock = clock
+
+        # next bucket the sweeper looks at, and the number of entries reclaimed
+        self._sweep_index = 0
+        self.expired_count = 0
+
+    def _entry(self, value: object, ttl: float) -> TTLEntry:
+        """ Wraps a value with its expiry time """
+        if ttl is _DEFAULT_TTL:
+            ttl = self.default_ttl
+        return TTLEntry(value, None if ttl is None else self.clock() + ttl)
+
+    def _live_entry(self, key: str) -> TTLEntry:
+        """
+        Returns the entry of the given key, or None if the key is not in the
+        hash map. An expired entry is removed and None returned.
+        """
+        entry = super().get(key)
+        if entry is not None and entry.expired(self.clock()):
+            super().remove(key)
+            self.expired_count += 1
+            return None
+        return entry
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the hash map or has expired, returns None.
+        """
+        entry = self._live_entry(key)
+        return None if entry is None else entry.value
+
+    def put(self, key: str, value: object, ttl: float = _DEFAULT_TTL) -> None:
+        """
+        Adds the given key:value pair to the hash map, expiring after ttl
+        seconds (default_ttl if not given, never if None). If the key is already present,
+        its value and expiry time are replaced. Then sweeps sweep_step buckets.
+        """
+        super().put(key, self._entry(value, ttl))
+        self.sweep(self.sweep_step)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and has not
+        expired, otherwise False.
+        """
+        return self._live_entry(key) is not None
+
+    def put_many(self, pairs, ttl: float = _DEFAULT_TTL) -> None:
+        """
+        Adds every key:value pair of the given iterable to the hash map,
+        all expiring after ttl seconds (default_ttl if not given, never
+        if None).
+        """
+        super().put_many((key, self._entry(value, ttl)) for key, value in pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns a new DynamicArray holding the value of each of the given
+        keys, in the same order (None for keys missing or expired).
+        Expired entries are left for the sweeper.
+        """
+        now = self.clock()
+        results = super().get_many(keys)
+        for pos in range(results.length()):
+            entry = results.get_at_index(pos)
+            if entry is not None:
+                results.set_at_index(pos, None if entry.expired(now) else entry.value)
+        return results
+
+    def sweep(self, bucket_count: int) -> int:
+        """
+        Removes the expired entries from the next bucket_count buckets,
+        wrapping around at the end of the table, and returns how many were
+        removed. Does nothing while an incremental resize is in progress
+        (the resize is already walking the table).
+        """
+        if self.size == 0 or self._old_buckets is not None:
+            return 0
+
+        now = self.clock()
+        removed = 0
+        for _ in range(min(bucket_count, self.capacity)):
+            index = self._sweep_index % self.capacity
+            self._sweep_index = index + 1
+
+            bucket = self.buckets.get_at_index(index)
+            if bucket is None or bucket.length() == 0:
+                continue
+
+            node = bucket.head
+            while node is not None:
+                next_node = node.next
+                if node.value.expired(now):
+                    self._remove_from_bucket(bucket, node.key, node.hash)
+                    removed += 1
+                node = next_node
+
+        if removed > 0:
+            self.expired_count += removed
+
+            # shrink as many times as the smaller size allows
+            old_capacity = None
+            while old_capacity != self.capacity:
+                old_capacity = self.capacity
+                self._shrink_if_needed()
+
+        return removed
+
+    def _live_nodes(self):
+        """ Generator yielding every node whose entry has not expired """
+        now = self.clock()
+        return (node for node in self._nodes() if not node.value.expired(now))
+
+    def keys(self):
+        """
+        Returns a generator over the keys that have not expired.
+        """
+        return (node.key for node in self._live_nodes())
+
+    def values(self):
+        """
+        Returns a generator over the values that have not expired.
+        """
+        return (node.value.value for node in self._live_nodes())
+
+    def items(self):
+        """
+        Returns a generator over the (key, value) pairs that have not expired.
+        """
+        return ((node.key, node.value.value) for node in self._live_nodes())
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the hash map that have not expired and returns
+        them in a new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for key in self.keys():
+            temp_da.append(key)
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    # a clock the examples can move forward by hand
+    now = [0.0]
+
+    def clock() -> float:
+        return now[0]
+
+    print("\nlazy expiry")
+    print("-----------")
+    m = TTLHashMap(10, 'fnv1a', default_ttl=5, sweep_step=0, clock=clock)
+    m.put('session1', 'alice')
+    m.put('session2', 'bob', ttl=20)
+    m.put('config', 'kept', ttl=None)
+    print(m.get('session1'), m.get('session2'), m.size)
+    now[0] = 10.0
+    print(m.get('session1'), m.contains_key('session2'), m.size, m.get_keys())
+    now[0] = 30.0
+    print(sorted(m.items()), m.size, m.expired_count)
+
+    print("\nincremental sweep")
+    print("-----------------")
+    now[0] = 0.0
+    m = TTLHashMap(64, 'fnv1a', sweep_step=4, clock=clock, max_load_factor=1.0, min_load_factor=0.25)
+    m.put_many((('key' + str(i), i) for i in range(1000)), ttl=1)
+    print(m.size, m.capacity)
+    now[0] = 2.0
+    for i in range(100):
+        m.put('new' + str(i), i)
+    print(m.size, m.expired_count)
+    print(m.sweep(m.capacity), m.size, m.capacity, m.expired_count)
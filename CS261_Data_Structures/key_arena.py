@@ -0,0 +1,141 @@
+# Course: CS261 - Data Structures
+# Description: Key arena for HashMap. Every distinct key is stored once, as
+#              length-prefixed UTF-8 bytes in one contiguous bytearray, and
+#              nodes refer to their key by its offset in the arena instead of
+#              holding a str object.
+
+
+import struct
+
+# Import pre-written DynamicArray class and the typed array
+from a7_include import *
+
+_LENGTH = struct.Struct('<I')
+
+
+class ArenaSLNode:
+    """
+    Singly Linked List Node with the interface of HashedSLNode whose key
+    lives in a KeyArena. key is read (decoded) from the arena on access;
+    HashedLinkedList compares the stored hashes first, so that only happens
+    for the node a lookup is looking for.
+
+    The arena is a class attribute of a subclass made for each arena
+    (KeyArena.node_class), so nodes do not spend a slot on it.
+    """
+
+    __slots__ = ('next', 'offset', 'value', 'hash')
+    arena = None
+
+    def __init__(self, offset: int, value: object, key_hash: int) -> None:
+        """ Init new node for the key at the given arena offset """
+        self.next = None
+        self.offset = offset
+        self.value = value
+        self.hash = key_hash
+
+    @property
+    def key(self) -> str:
+        """ The node's key, decoded from the arena """
+        return self.arena.key_at(self.offset)
+
+    def __str__(self):
+        """ Return content of the node in human-readable form """
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
+
+
+class KeyArena:
+    """
+    Append-only store of distinct string keys. Each key is interned: adding
+    a key that is already in the arena returns the offset it already has,
+    so several HashMaps (or one map that removes and re-adds keys) can share
+    one copy of every key. The intern table is an open-addressed table of
+    offsets in a TypedDynamicArray, probed with the built-in hash() of the
+    key.
+
+    Bytes are never reclaimed: keys stay in the arena after every map
+    using them removed them.
+    """
+
+    def __init__(self) -> None:
+        """ Init new empty arena """
+        self.data = bytearray()
+        self.size = 0
+        # intern table - offset + 1 of a key in each slot, 0 for an empty slot
+        self._slots = TypedDynamicArray([0] * 16)
+        self.node_class = type('ArenaSLNode', (ArenaSLNode,), {'__slots__': (), 'arena': self})
+
+    def key_at(self, offset: int) -> str:
+        """ Returns the key stored at the given offset """
+        length = _LENGTH.unpack_from(self.data, offset)[0]
+        return self.data[offset + 4:offset + 4 + length].decode()
+
+    def _probe(self, key_bytes: bytes, key_hash: int) -> tuple:
+        """
+        Returns the intern table slot of the given key and its offset, or the
+        first empty slot on its probe path and -1 if it is not in the arena.
+        """
+        slots, mask, data = self._slots, self._slots.length() - 1, self.data
+        length = len(key_bytes)
+        slot = key_hash & mask
+        while True:
+            offset = slots.get_at_index(slot) - 1
+            if offset < 0:
+                return slot, -1
+            if (_LENGTH.unpack_from(data, offset)[0] == length
+                    and data[offset + 4:offset + 4 + length] == key_bytes):
+                return slot, offset
+            slot = (slot + 1) & mask
+
+    def find(self, key: str) -> int:
+        """ Returns the offset of the given key, or -1 if it is not in the arena """
+        return self._probe(key.encode(), hash(key))[1]
+
+    def intern(self, key: str) -> int:
+        """
+        Returns the offset of the given key, adding it to the arena first if
+        it is not there yet
+        """
+        key_bytes = key.encode()
+        slot, offset = self._probe(key_bytes, hash(key))
+        if offset >= 0:
+            return offset
+
+        offset = len(self.data)
+        self.data += _LENGTH.pack(len(key_bytes))
+        self.data += key_bytes
+        self._slots.set_at_index(slot, offset + 1)
+        self.size += 1
+
+        # keep the intern table at most half full
+        if self.size * 2 > self._slots.length():
+            self._grow()
+        return offset
+
+    def _grow(self) -> None:
+        """ Doubles the intern table and places every key in it again """
+        old_slots = self._slots
+        self._slots = TypedDynamicArray([0] * (old_slots.length() * 2))
+        for pos in range(old_slots.length()):
+            offset = old_slots.get_at_index(pos) - 1
+            if offset >= 0:
+                key = self.key_at(offset)
+                slot = self._probe(key.encode(), hash(key))[0]
+                self._slots.set_at_index(slot, offset + 1)
+
+    def node(self, key: str, value: object, key_hash: int) -> ArenaSLNode:
+        """ Returns a new node for the given key (interned) and value """
+        return self.node_class(self.intern(key), value, key_hash)
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nintern / find")
+    print("-------------")
+    arena = KeyArena()
+    offsets = [arena.intern('key' + str(i % 50)) for i in range(200)]
+    print(arena.size, len(arena.data), offsets[0] == offsets[50], arena.find('key7') == offsets[7])
+    print(arena.find('missing'), arena.key_at(offsets[42]), arena.intern('röck'), arena.key_at(arena.find('röck')))
+    node = arena.node('key3', 'value', 0)
+    print(node, node.key == 'key3', type(node).arena is arena)
@@ -0,0 +1,290 @@
+# Course: CS261 - Data Structures
+# Description: Ordered map companion to HashMap - an indexable skip list that
+#              keeps its keys sorted, so range, prefix and rank queries take
+#              O(log n) (plus the size of the answer) instead of a get_keys()
+#              and a sort per query.
+
+
+import random
+
+# Import pre-written DynamicArray class
+from a7_include import *
+
+
+class SkipListNode:
+    """
+    Skip List Node. next[i] is the following node on level i (None at the
+    end) and width[i] the number of level 0 steps that link covers.
+    """
+
+    __slots__ = ('key', 'value', 'next', 'width')
+
+    def __init__(self, key: str, value: object, level: int) -> None:
+        """ Init new node with the given number of levels """
+        self.key = key
+        self.value = value
+        self.next = [None] * level
+        self.width = [1] * level
+
+    def __str__(self):
+        """ Return content of the node in human-readable form """
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
+
+
+class OrderedMap:
+    """
+    Map with the put/get/remove/contains_key/get_keys interface of
+    hash_map.HashMap whose keys are kept in sorted order.
+
+    Implemented as a skip list in which every link also stores how many
+    nodes it skips (its width), so the position of a key (rank) and the key
+    at a position (key_at) are found on the same O(log n) expected path as
+    the key itself. Keys can be of any mutually comparable type.
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self, seed: int = None) -> None:
+        """
+        Init new empty ordered map. seed fixes the random node levels, which
+        only affect speed, never results.
+        """
+        # head sits before the first node at position 0; the first node is at
+        # position 1, and a link to None reaches position size + 1
+        self.head = SkipListNode(None, None, self.MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+        self._random = random.Random(seed)
+
+    def __str__(self) -> str:
+        """
+        Return content of the ordered map in human-readable form
+        """
+        return 'ORDERED_MAP [' + ', '.join(str(node) for node in self._nodes_from(self.head.next[0])) + ']'
+
+    def __len__(self) -> int:
+        """ Return the number of key:value pairs in the map """
+        return self.size
+
+    def __contains__(self, key: str) -> bool:
+        """ Supports the 'key in ordered_map' syntax """
+        return self.contains_key(key)
+
+    def __iter__(self):
+        """ Provides iterator capability over the keys in sorted order """
+        return (node.key for node in self._nodes_from(self.head.next[0]))
+
+    def _random_level(self) -> int:
+        """ Returns a level between 1 and MAX_LEVEL, each one half as likely as the one below """
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _search(self, key: str) -> tuple:
+        """
+        Returns two lists: for every level, the last node whose key is less
+        than the given key, and that node's position.
+        """
+        update = [None] * self.level
+        rank = [0] * self.level
+        node, pos = self.head, 0
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                pos += node.width[i]
+                node = node.next[i]
+            update[i] = node
+            rank[i] = pos
+        return update, rank
+
+    def _find_node(self, key: str) -> SkipListNode:
+        """ Returns the node holding the given key, or None if there is none """
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+        node = node.next[0]
+        if node is not None and node.key == key:
+            return node
+        return None
+
+    def _first_node_from(self, key: str) -> SkipListNode:
+        """ Returns the first node whose key is >= the given key, or None """
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+        return node.next[0]
+
+    def _nodes_from(self, node: SkipListNode):
+        """ Generator yielding the given node and every node after it on level 0 """
+        while node is not None:
+            yield node
+            node = node.next[0]
+
+    def clear(self) -> None:
+        """
+        Removes every key:value pair from the map. Returns nothing.
+        """
+        self.head = SkipListNode(None, None, self.MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the given key.
+        If the key is not in the map, returns None.
+        """
+        node = self._find_node(key)
+        return None if node is None else node.value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds the given key:value pair to the map. If the key is already
+        present, only its value is replaced.
+        """
+        update, rank = self._search(key)
+        node = update[0].next[0]
+        if node is not None and node.key == key:
+            node.value = value
+            return None
+
+        # links of the new levels start at the head and run to the end
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                update.append(self.head)
+                rank.append(0)
+                self.head.width[i] = self.size + 1
+            self.level = level
+
+        # splice the node in after update[i] on each of its levels, splitting
+        # that link's width; links passing over it on higher levels get 1 longer
+        node = SkipListNode(key, value, level)
+        for i in range(level):
+            prev = update[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            node.width[i] = prev.width[i] - (rank[0] - rank[i])
+            prev.width[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].width[i] += 1
+
+        self.size += 1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the map.
+        Does nothing if the key is not present.
+        """
+        update, rank = self._search(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return None
+
+        # links to the node take over its links; links passing over it get 1 shorter
+        for i in range(self.level):
+            if update[i].next[i] is node:
+                update[i].width[i] += node.width[i] - 1
+                update[i].next[i] = node.next[i]
+            else:
+                update[i].width[i] -= 1
+
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the map, otherwise False.
+        """
+        return self._find_node(key) is not None
+
+    def rank(self, key: str) -> int:
+        """
+        Returns the number of keys in the map that are less than the given
+        key (its index in sorted order if it is in the map).
+        """
+        return self._search(key)[1][0]
+
+    def key_at(self, index: int) -> str:
+        """
+        Returns the key at the given index in sorted order. Raises
+        DynamicArrayException if the index is out of range.
+        """
+        if index < 0 or index >= self.size:
+            raise DynamicArrayException
+
+        node, pos = self.head, 0
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and pos + node.width[i] <= index + 1:
+                pos += node.width[i]
+                node = node.next[i]
+        return node.key
+
+    def range(self, lo: str, hi: str) -> DynamicArray:
+        """
+        Returns a new DynamicArray with the keys k where lo <= k < hi, in
+        sorted order.
+        """
+        temp_da = DynamicArray()
+        for node in self._nodes_from(self._first_node_from(lo)):
+            if not node.key < hi:
+                break
+            temp_da.append(node.key)
+        return temp_da
+
+    def prefix(self, prefix: str) -> DynamicArray:
+        """
+        Returns a new DynamicArray with the (string) keys that start with
+        the given prefix, in sorted order.
+        """
+        temp_da = DynamicArray()
+        for node in self._nodes_from(self._first_node_from(prefix)):
+            if not node.key.startswith(prefix):
+                break
+            temp_da.append(node.key)
+        return temp_da
+
+    def items(self, lo: str = None, hi: str = None):
+        """
+        Generator over the (key, value) pairs in sorted order,
+        starting at the first key >= lo and stopping before the first key
+        >= hi (either bound may be None).
+        """
+        node = self.head.next[0] if lo is None else self._first_node_from(lo)
+        for node in self._nodes_from(node):
+            if hi is not None and not node.key < hi:
+                return
+            yield node.key, node.value
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Finds all keys in the map and returns them in sorted order in a
+        new DynamicArray object.
+        """
+        temp_da = DynamicArray()
+        for key in self:
+            temp_da.append(key)
+        return temp_da
+
+
+# BASIC TESTING
+if __name__ == "__main__":
+
+    print("\nput / get / remove")
+    print("------------------")
+    m = OrderedMap(seed=261)
+    for word in ['pear', 'apple', 'fig', 'banana', 'cherry', 'apricot', 'grape', 'plum']:
+        m.put(word, len(word))
+    m.put('fig', 'replaced')
+    print(m.size, m.get('fig'), m.get('kiwi'), m.contains_key('plum'))
+    m.remove('pear')
+    m.remove('kiwi')
+    print(m)
+
+    print("\nrange / prefix / rank")
+    print("---------------------")
+    print(m.range('b', 'g'), m.prefix('ap'), m.prefix('z'))
+    print(m.rank('apple'), m.rank('cherry'), m.rank('coconut'), m.rank('zucchini'))
+    print(m.key_at(0), m.key_at(m.size - 1), list(m.items('c', 'h')))